@@ -1,14 +1,44 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import re
+import os
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import time
 
+# (connect, read) timeout in seconds for every request
+REQUEST_TIMEOUT = (5, 30)
+
+# Files smaller than this per part aren't worth splitting into ranges
+MIN_RANGE_PART_SIZE = 1024 * 1024
+
+def create_session():
+    """Create a requests session with connection pooling and retries"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504]
+        )
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+# Shared session so every download reuses the same keep-alive connections
+_SESSION = create_session()
+
 class USCReleaseDownloader:
-    def __init__(self, download_dir="downloads"):
+    def __init__(self, download_dir="downloads", session=None):
         self.download_dir = Path(download_dir)
         self.base_url = "https://uscode.house.gov/download/releasepoints/"
         self.download_dir.mkdir(exist_ok=True)
+        self.session = session or _SESSION
 
     def find_latest_releases(self):
         """Find the latest release points for all titles"""
@@ -19,7 +49,7 @@ class USCReleaseDownloader:
 
         try:
             # Get the release points page
-            response = requests.get("https://uscode.house.gov/download/download.shtml")
+            response = self.session.get("https://uscode.house.gov/download/download.shtml", timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
 
             # Parse the HTML
@@ -69,7 +99,7 @@ class USCReleaseDownloader:
 
         try:
             # Send a GET request to the URL
-            response = requests.get(url, stream=True)
+            response = self.session.get(url, stream=True, timeout=REQUEST_TIMEOUT)
 
             # Check if the request was successful
             if response.status_code == 200:
@@ -128,7 +158,7 @@ class USCReleaseDownloader:
 
         try:
             # Send a GET request to the URL
-            response = requests.get(url, stream=True)
+            response = self.session.get(url, stream=True, timeout=REQUEST_TIMEOUT)
 
             # Check if the request was successful
             if response.status_code == 200:
@@ -147,11 +177,84 @@ class USCReleaseDownloader:
             print(f"Error downloading: {e}")
             return False
 
-def find_all_release_points():
+    def download_ranged(self, url, output_filename, parts=4):
+        """Download from a direct URL as several concurrent byte ranges
+
+        Falls back to a single-stream download when the server doesn't
+        advertise range support, the file is small, or a range request
+        comes back as a full 200 response.
+        """
+        output_file = self.download_dir / output_filename
+
+        try:
+            head = self.session.head(url, allow_redirects=True, timeout=REQUEST_TIMEOUT)
+            size = int(head.headers.get('Content-Length', 0))
+            accepts_ranges = head.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        except (requests.RequestException, ValueError) as e:
+            print(f"Range probe failed ({e}), downloading in one piece")
+            return self.download_from_direct_url(url, output_filename)
+
+        if head.status_code != 200 or not accepts_ranges or size < parts * MIN_RANGE_PART_SIZE:
+            return self.download_from_direct_url(url, output_filename)
+
+        print(f"Downloading from {url} in {parts} parts...")
+
+        # Parts are written into a .part file that only replaces the real
+        # file once every range has arrived, so a failed download never
+        # leaves a full-size but zero-filled archive behind
+        part_file = output_file.with_name(output_filename + '.part')
+
+        # Pre-allocate the file so every part can write at its own offset
+        with open(part_file, 'wb') as f:
+            f.truncate(size)
+
+        part_size = -(-size // parts)
+        ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                results = list(executor.map(lambda r: self._download_range(url, part_file, *r), ranges))
+        except Exception as e:
+            print(f"Error downloading: {e}")
+            part_file.unlink(missing_ok=True)
+            return False
+
+        if not all(results):
+            print("Server ignored the range requests, downloading in one piece")
+            part_file.unlink(missing_ok=True)
+            return self.download_from_direct_url(url, output_filename)
+
+        os.replace(part_file, output_file)
+
+        print(f"Successfully downloaded to {output_file}")
+        return True
+
+    def _download_range(self, url, output_file, start, end):
+        """Download bytes start..end (inclusive) into a pre-allocated file
+
+        Returns:
+            bool: False if the server didn't answer with the requested range
+        """
+        headers = {'Range': f'bytes={start}-{end}'}
+        with self.session.get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            if response.status_code != 206:
+                return False
+
+            written = 0
+            with open(output_file, 'r+b') as f:
+                f.seek(start)
+                for chunk in response.iter_content(chunk_size=65536):
+                    f.write(chunk)
+                    written += len(chunk)
+
+        if written != end - start + 1:
+            raise IOError(f"Incomplete range {start}-{end}: got {written} bytes")
+
+        return True
+
+def find_all_release_points(session=None):
     """Find all available release points for all titles"""
-    import requests
-    from bs4 import BeautifulSoup
-    import re
+    session = session or _SESSION
 
     print("Finding all available release points...")
 
@@ -160,7 +263,7 @@ def find_all_release_points():
 
     try:
         # Get the release points page
-        response = requests.get("https://uscode.house.gov/download/download.shtml")
+        response = session.get("https://uscode.house.gov/download/download.shtml", timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
 
         # Parse the HTML
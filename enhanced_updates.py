@@ -11,15 +11,22 @@ This script provides an enhanced update system for the US Code, including:
 import logging
 import json
 import time
+import random
 import sys
 import os
 import shutil
+import tempfile
+import zipfile
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import urlparse
 import argparse
 
+import requests
+import urllib3
+
 # Import our modules
-from download_usc_releases import USCReleaseDownloader, find_all_release_points
+from download_usc_releases import USCReleaseDownloader, find_all_release_points, REQUEST_TIMEOUT
 from usc_processor import USCProcessor
 from verify_titles import verify_titles
 from update_tracker import USCodeUpdateTracker
@@ -33,15 +40,69 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(),
-        logging.FileHandler(log_dir / f'enhanced_update_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
+        logging.FileHandler(log_dir / f'enhanced_update_{time.strftime("%Y%m%d_%H%M%S")}.log')
     ]
 )
 
+# Don't let a broken log handler (full disk, closed stream) interrupt an update run
+logging.raiseExceptions = False
+
 logger = logging.getLogger('enhanced_updates')
 
+# Titles that are never downloaded (Title 53 is reserved)
+SKIP_TITLES = frozenset({53})
+
+# Streamed downloads stay in memory up to this size before spilling to disk
+STREAM_SPOOL_MAX_BYTES = 256 * 1024 * 1024
+
+def _drop_from_page_cache(path):
+    """Advise the kernel that a file's cached pages won't be needed again"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logger.debug("posix_fadvise failed for %s: %s", path, e)
+
+def copy_file_uncached(src, dst, keep_dst_cached=False):
+    """Copy a file without leaving it behind in the page cache
+    
+    Backup copies are read and written once, so keeping them cached only
+    evicts the processed data the web interface actually serves.
+    
+    Args:
+        src (Path): File to copy
+        dst (Path): Destination file or directory
+        keep_dst_cached (bool): Leave the destination's pages cached
+        
+    Returns:
+        str: Path of the copied file
+    """
+    copied = shutil.copy2(src, dst)
+    
+    _drop_from_page_cache(src)
+    if not keep_dst_cached:
+        _drop_from_page_cache(copied)
+    
+    return copied
+
 class EnhancedUpdater:
     """Enhanced US Code updater with robust error handling and recovery"""
     
+    # Exponential backoff between download attempts (seconds)
+    RETRY_BACKOFF_BASE = 2
+    RETRY_BACKOFF_CAP = 60
+    
+    # Per-host circuit breaker: stop trying a host after this many consecutive
+    # failures until the cool-down period has passed
+    BREAKER_FAILURE_THRESHOLD = 5
+    BREAKER_COOLDOWN_SECONDS = 300
+    
     def __init__(self, config_file="enhanced_updates_config.json"):
         """Initialize the enhanced updater
         
@@ -67,6 +128,9 @@ class EnhancedUpdater:
             download_dir=str(self.download_dir), 
             output_dir=str(self.processed_dir)
         )
+        
+        # Circuit breaker state: {host: (consecutive_failures, last_failure_time)}
+        self._breaker = {}
     
     def _load_config(self):
         """Load configuration from file or create default"""
@@ -90,7 +154,9 @@ class EnhancedUpdater:
                 "retry_delay_seconds": 300,
                 "backup_before_update": True,
                 "notify_on_update": True,
-                "validate_downloads": True
+                "validate_downloads": True,
+                "stream_process": False,
+                "keep_downloads": False
             },
             "notifications": {
                 "send_email": True,
@@ -131,7 +197,7 @@ class EnhancedUpdater:
             
             # Copy all processed files
             for file in self.processed_dir.glob("*.json"):
-                shutil.copy2(file, backup_path)
+                copy_file_uncached(file, backup_path)
             
             logger.info(f"Backup created at {backup_path}")
             return str(backup_path)
@@ -172,8 +238,9 @@ class EnhancedUpdater:
                 file.unlink()
             
             # Copy files from backup
+            # Restored files are served right away, so only drop the backup side
             for file in backup_path.glob("*.json"):
-                shutil.copy2(file, self.processed_dir)
+                copy_file_uncached(file, self.processed_dir, keep_dst_cached=True)
             
             logger.info(f"Restored from backup: {backup_path}")
             return True
@@ -182,34 +249,55 @@ class EnhancedUpdater:
             logger.error(f"Error restoring from backup: {e}")
             return False
     
-    def validate_download(self, file_path):
-        """Validate a downloaded file
+    def validate_download(self, zip_ref):
+        """Validate a downloaded ZIP archive
         
         Args:
-            file_path (str): Path to the downloaded file
+            zip_ref (zipfile.ZipFile): The opened download
             
         Returns:
-            bool: True if file is valid
+            bool: True if every member's CRC checks out
         """
-        file_path = Path(file_path)
-        
-        if not file_path.exists():
-            logger.error(f"File does not exist: {file_path}")
-            return False
-        
-        # Check file size
-        if file_path.stat().st_size < 1000:  # Arbitrary minimum size
-            logger.error(f"File too small: {file_path}")
+        bad_member = zip_ref.testzip()
+        if bad_member is not None:
+            logger.error("Corrupt member %s in %s", bad_member, zip_ref.filename)
             return False
         
-        # For ZIP files, we could add more validation here
-        # such as checking if it's a valid ZIP archive
-        
         return True
     
+    def _retry_delay(self, attempt):
+        """Compute a jittered exponential backoff delay for a retry
+        
+        Args:
+            attempt (int): The attempt that just failed (1-based)
+            
+        Returns:
+            float: Seconds to wait before the next attempt
+        """
+        # retry_delay_seconds still acts as an upper bound when set lower than the cap
+        cap = min(self.RETRY_BACKOFF_CAP, self.config['update']['retry_delay_seconds'])
+        delay = min(cap, self.RETRY_BACKOFF_BASE * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.5)
+    
+    def _breaker_is_open(self, host):
+        """Check whether the circuit breaker for a host is open"""
+        failures, last_failure = self._breaker.get(host, (0, 0.0))
+        if failures < self.BREAKER_FAILURE_THRESHOLD:
+            return False
+        return time.monotonic() - last_failure < self.BREAKER_COOLDOWN_SECONDS
+    
+    def _record_failure(self, host):
+        """Record a failed download attempt against a host"""
+        failures, _ = self._breaker.get(host, (0, 0.0))
+        self._breaker[host] = (failures + 1, time.monotonic())
+    
     def download_with_retry(self, url, output_filename, max_attempts=None):
         """Download a file with retry logic
         
+        Failed attempts are retried with jittered exponential backoff. After
+        repeated failures against the same host the circuit breaker opens and
+        further downloads from that host fail fast until the cool-down expires.
+        
         Args:
             url (str): URL to download
             output_filename (str): Output filename
@@ -221,38 +309,115 @@ class EnhancedUpdater:
         if max_attempts is None:
             max_attempts = self.config['update']['retry_attempts']
         
-        retry_delay = self.config['update']['retry_delay_seconds']
+        host = urlparse(url).netloc
         
         for attempt in range(1, max_attempts + 1):
-            logger.info(f"Download attempt {attempt}/{max_attempts}: {url}")
+            if self._breaker_is_open(host):
+                logger.error("Circuit breaker open for %s, skipping download: %s", host, url)
+                return False
+            
+            logger.info("Download attempt %d/%d: %s", attempt, max_attempts, url)
             
             success = self.downloader.download_from_direct_url(url, output_filename)
             
             if success:
-                output_path = self.download_dir / output_filename
-                
-                # Validate the download if enabled
-                if self.config['update']['validate_downloads']:
-                    if not self.validate_download(output_path):
-                        logger.error(f"Downloaded file failed validation: {output_path}")
-                        if attempt < max_attempts:
-                            logger.info(f"Retrying in {retry_delay} seconds...")
-                            time.sleep(retry_delay)
-                            continue
-                        return False
-                
-                logger.info(f"Download successful: {output_filename}")
+                self._breaker.pop(host, None)
+                logger.info("Download successful: %s", output_filename)
                 return True
             
+            self._record_failure(host)
+            
             if attempt < max_attempts:
-                logger.info(f"Download failed, retrying in {retry_delay} seconds...")
+                retry_delay = self._retry_delay(attempt)
+                logger.info("Download failed, retrying in %.1f seconds...", retry_delay)
                 time.sleep(retry_delay)
             else:
-                logger.error(f"Download failed after {max_attempts} attempts: {url}")
+                logger.error("Download failed after %d attempts: %s", max_attempts, url)
                 return False
         
         return False
     
+    def _process_archive(self, source, name):
+        """Open a downloaded archive once, validate it and process it
+        
+        Args:
+            source (Path or file object): The ZIP file on disk or in memory
+            name (str): Archive filename, used for title/release detection
+            
+        Returns:
+            bool: True if the archive was valid and processed
+        """
+        try:
+            with zipfile.ZipFile(source, 'r') as zip_ref:
+                if self.config['update']['validate_downloads'] and not self.validate_download(zip_ref):
+                    logger.error("Downloaded file failed validation: %s", name)
+                    return False
+                
+                return self.processor.process_zip_archive(zip_ref, name=name)
+        except zipfile.BadZipFile as e:
+            logger.error("Downloaded file is not a valid ZIP archive: %s: %s", name, e)
+            return False
+    
+    def _download_and_process_stream(self, url, output_filename):
+        """Download a title and process it without the disk round-trip
+        
+        The response is spooled in memory (spilling to a temporary file for
+        very large titles) and processed directly. The ZIP is only written to
+        the download directory when keep_downloads is enabled.
+        
+        Args:
+            url (str): URL to download
+            output_filename (str): Archive filename
+            
+        Returns:
+            bool: True if download and processing were successful
+        """
+        max_attempts = self.config['update']['retry_attempts']
+        host = urlparse(url).netloc
+        
+        with tempfile.SpooledTemporaryFile(max_size=STREAM_SPOOL_MAX_BYTES) as buf:
+            # Retried with the same backoff and circuit breaker as
+            # download_with_retry
+            for attempt in range(1, max_attempts + 1):
+                if self._breaker_is_open(host):
+                    logger.error("Circuit breaker open for %s, skipping download: %s", host, url)
+                    return False
+                
+                # Drop whatever a failed attempt spooled
+                buf.seek(0)
+                buf.truncate()
+                
+                try:
+                    logger.info("Streaming download attempt %d/%d: %s", attempt, max_attempts, url)
+                    with self.downloader.session.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                        response.raise_for_status()
+                        response.raw.decode_content = True
+                        shutil.copyfileobj(response.raw, buf)
+                    break
+                except (requests.RequestException, urllib3.exceptions.HTTPError) as e:
+                    # urllib3 errors come from reading response.raw mid-stream
+                    self._record_failure(host)
+                    
+                    if attempt < max_attempts:
+                        retry_delay = self._retry_delay(attempt)
+                        logger.info("Streaming download failed (%s), retrying in %.1f seconds...", e, retry_delay)
+                        time.sleep(retry_delay)
+                    else:
+                        logger.error("Streaming download failed after %d attempts: %s: %s", max_attempts, url, e)
+                        return False
+            else:
+                return False
+            
+            self._breaker.pop(host, None)
+            
+            if self.config['update'].get('keep_downloads', False):
+                buf.seek(0)
+                with open(self.download_dir / output_filename, 'wb') as f:
+                    shutil.copyfileobj(buf, f)
+            
+            buf.seek(0)
+            return self._process_archive(buf, output_filename)
+    
     def process_title(self, title_num, release_info):
         """Process a specific title
         
@@ -275,20 +440,26 @@ class EnhancedUpdater:
             output_filename = f"title{title_str}_{release_version}.zip"
             output_path = self.download_dir / output_filename
             
-            # Download the file with retry
-            success = self.download_with_retry(url, output_filename)
+            if self.config['update'].get('stream_process', False):
+                logger.info("Processing Title %s...", title_str)
+                success = self._download_and_process_stream(url, output_filename)
+            else:
+                # Download the file with retry
+                success = self.download_with_retry(url, output_filename)
+                if not success:
+                    return False
+                
+                logger.info("Processing Title %s...", title_str)
+                success = self._process_archive(output_path, output_filename)
+            
             if not success:
                 return False
             
-            # Process the file
-            logger.info(f"Processing Title {title_str}...")
-            self.processor.process_zip_file(output_path)
-            
-            logger.info(f"Title {title_str} processed successfully")
+            logger.info("Title %s processed successfully", title_str)
             return True
         
         except Exception as e:
-            logger.error(f"Error processing Title {title_num}: {e}")
+            logger.error("Error processing Title %s: %s", title_num, e)
             return False
     
     def run_update(self):
@@ -309,6 +480,7 @@ class EnhancedUpdater:
         logger.info(f"New release available: {previous_release['public_law']} -> {current_release['public_law']}")
         
         # Create backup if enabled
+        backup_path = None
         if self.config['update']['backup_before_update']:
             backup_path = self.create_backup()
             if not backup_path:
@@ -324,10 +496,9 @@ class EnhancedUpdater:
         processed_titles = []
         failed_titles = []
         
-        for title_num in sorted(all_releases.keys()):
-            if title_num == 53:  # Skip title 53 as it's reserved
-                continue
-            
+        titles = sorted(k for k in all_releases if k not in SKIP_TITLES)
+        
+        for title_num in titles:
             # Get the latest release for this title
             latest_release = all_releases[title_num][0]
             
@@ -345,8 +516,12 @@ class EnhancedUpdater:
         # Verify the processed titles
         title_numbers, missing_titles, invalid_files = verify_titles()
         
-        # Generate changelog
-        changelog = self.tracker.generate_changelog(current_release, previous_release)
+        # Generate changelog, diffing the sections against the backup of the
+        # previous release's processed data when there is one
+        changelog = self.tracker.generate_changelog(
+            current_release, previous_release,
+            previous_dir=backup_path, current_dir=self.processed_dir if backup_path else None
+        )
         
         # Save the current release info
         self.tracker.save_release_info(current_release)
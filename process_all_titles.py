@@ -17,25 +17,30 @@ logging.basicConfig(
 
 logger = logging.getLogger('process_all_titles')
 
-def download_and_process_title(title_num, download_dir="downloads", output_dir="processed", force_download=False):
-    """Download and process a specific title"""
-    # Initialize downloader and processor
-    downloader = USCReleaseDownloader(download_dir=download_dir)
-    processor = USCProcessor(download_dir=download_dir, output_dir=output_dir)
-
+def download_and_process_title(title_num, downloader, processor, all_releases=None, force_download=False):
+    """Download and process a specific title
+
+    Args:
+        title_num (int): Title number to process
+        downloader (USCReleaseDownloader): Shared downloader (reuses its HTTP session)
+        processor (USCProcessor): Shared processor
+        all_releases (dict): Release points from find_all_release_points(), or None to look them up
+        force_download (bool): Download and process even if files already exist
+    """
     # Format title number with leading zeros
     title_str = str(title_num).zfill(2)
 
     # Check if we already have the processed JSON file
     json_pattern = f"title{title_str}_*.json"
-    existing_json = list(Path(output_dir).glob(json_pattern))
+    existing_json = list(processor.output_dir.glob(json_pattern))
 
     if existing_json and not force_download:
         logger.info(f"Title {title_str} already processed: {existing_json[0].name}")
         return True
 
     # Find the latest release for this title
-    all_releases = find_all_release_points()
+    if all_releases is None:
+        all_releases = find_all_release_points(session=downloader.session)
 
     if title_num not in all_releases:
         logger.error(f"No release found for Title {title_str}")
@@ -48,7 +53,7 @@ def download_and_process_title(title_num, download_dir="downloads", output_dir="
 
     # Construct the output filename
     output_filename = f"title{title_str}_{release_info}.zip"
-    output_path = Path(download_dir) / output_filename
+    output_path = downloader.download_dir / output_filename
 
     # Check if we already have the downloaded file
     if output_path.exists() and not force_download:
@@ -69,8 +74,12 @@ def download_and_process_title(title_num, download_dir="downloads", output_dir="
 
 def process_all_titles(download_dir="downloads", output_dir="processed", force_download=False):
     """Download and process all titles"""
+    # Build the downloader and processor once so every title shares one HTTP session
+    downloader = USCReleaseDownloader(download_dir=download_dir)
+    processor = USCProcessor(download_dir=download_dir, output_dir=output_dir)
+
     # Find all available titles
-    all_releases = find_all_release_points()
+    all_releases = find_all_release_points(session=downloader.session)
 
     if not all_releases:
         logger.error("No releases found")
@@ -90,8 +99,9 @@ def process_all_titles(download_dir="downloads", output_dir="processed", force_d
         try:
             success = download_and_process_title(
                 title_num,
-                download_dir=download_dir,
-                output_dir=output_dir,
+                downloader,
+                processor,
+                all_releases=all_releases,
                 force_download=force_download
             )
 
@@ -120,8 +130,8 @@ if __name__ == "__main__":
         # Process a specific title
         download_and_process_title(
             args.title,
-            download_dir=args.download_dir,
-            output_dir=args.output_dir,
+            USCReleaseDownloader(download_dir=args.download_dir),
+            USCProcessor(download_dir=args.download_dir, output_dir=args.output_dir),
             force_download=args.force
         )
     elif args.all:
@@ -1,17 +1,36 @@
-import requests
 from bs4 import BeautifulSoup
 import re
 import logging
 import json
 from pathlib import Path
-import time
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 import sys
 import os
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# msgpack gives a compact binary format for the update bookkeeping file
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# BeautifulSoup's lxml tree builder is far faster than the pure-Python html.parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
 # Import our modules
-from download_usc_releases import USCReleaseDownloader, find_all_release_points
-from usc_processor import USCProcessor
+from download_usc_releases import USCReleaseDownloader, find_all_release_points, create_session, REQUEST_TIMEOUT
+from usc_processor import process_zip_worker
 from verify_titles import verify_titles
 
 # Configure logging
@@ -29,38 +48,147 @@ logging.basicConfig(
 
 logger = logging.getLogger('scheduled_updates')
 
+# Titles that are never downloaded (Title 53 is reserved)
+SKIP_TITLES = frozenset({53})
+
+# Number of titles downloaded at once (also bounds connections to the server)
+MAX_CONCURRENT_DOWNLOADS = 8
+
+# Byte ranges fetched in parallel per title; together with the title
+# concurrency this stays within the session's 16-connection pool
+RANGE_DOWNLOAD_PARTS = 2
+
+# One pooled keep-alive session for every request this module makes
+_SESSION = create_session()
+
+# Release page URL and the validators/result from the last time it was fetched
+RELEASE_PAGE_URL = "https://uscode.house.gov/download/download.shtml"
+RELEASE_CACHE_FILE = Path("release_cache.json")
+
+# Update bookkeeping: msgpack when available, with the JSON file as the
+# legacy/fallback format
+UPDATE_INFO_FILE = Path("update_info.msgpack")
+UPDATE_INFO_JSON_FILE = Path("update_info.json")
+
+# Matches e.g. "Public Law 119-4 (04/11/2025)" directly in the raw page bytes
+RELEASE_POINT_BYTES_RE = re.compile(rb'Public Law (\d+-\d+) \((\d+/\d+/\d+)\)')
+
+def read_json_file(path):
+    """Read a JSON file, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def write_json_file(path, data):
+    """Write a JSON file, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+def load_release_cache():
+    """Load the cached release point and its HTTP validators"""
+    if RELEASE_CACHE_FILE.exists():
+        try:
+            return read_json_file(RELEASE_CACHE_FILE)
+        except Exception as e:
+            logger.warning(f"Error loading release cache: {e}")
+    return {}
+
+def scan_for_release_point(response):
+    """Scan a streamed response for the release point, stopping at the first match
+    
+    Returns:
+        tuple: (release dict or None, full body if no match was found)
+    """
+    chunks = []
+    tail = b''
+    for chunk in response.iter_content(chunk_size=65536):
+        chunks.append(chunk)
+        # Keep the end of the previous chunk so a match can span chunk boundaries
+        window = tail + chunk
+        match = RELEASE_POINT_BYTES_RE.search(window)
+        if match:
+            return {
+                'public_law': match.group(1).decode(),
+                'date': match.group(2).decode()
+            }, None
+        tail = window[-128:]
+    
+    return None, b''.join(chunks)
+
+def parse_release_point_html(content):
+    """Find the release point in the parsed release page HTML"""
+    soup = BeautifulSoup(content, HTML_PARSER)
+    
+    # Look for the current release point information
+    release_info = soup.find(string=re.compile(r'Public Law \d+-\d+ \(\d+/\d+/\d+\)'))
+    if release_info:
+        match = re.search(r'Public Law (\d+-\d+) \((\d+/\d+/\d+)\)', release_info)
+        if match:
+            return {
+                'public_law': match.group(1),
+                'date': match.group(2)
+            }
+    
+    return None
+
 def get_current_release_point():
-    """Get the current release point from the website"""
+    """Get the current release point from the website
+    
+    Sends If-None-Match/If-Modified-Since from the previous fetch so an
+    unchanged page costs a 304 response instead of a full download and parse.
+    Otherwise the page is streamed and the connection released as soon as
+    the release point has been found; the HTML is only parsed if the raw
+    scan finds nothing.
+    """
     try:
-        response = requests.get("https://uscode.house.gov/download/download.shtml")
-        response.raise_for_status()
+        cache = load_release_cache()
+        headers = {}
+        if cache.get('etag'):
+            headers['If-None-Match'] = cache['etag']
+        if cache.get('last_modified'):
+            headers['If-Modified-Since'] = cache['last_modified']
+        
+        with _SESSION.get(RELEASE_PAGE_URL, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            if response.status_code == 304 and cache.get('release'):
+                logger.info("Release page not modified since last check")
+                return cache['release']
+            
+            response.raise_for_status()
+            
+            release, body = scan_for_release_point(response)
+            validators = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        if release is None:
+            release = parse_release_point_html(body)
         
-        # Look for the current release point information
-        release_info = soup.find(string=re.compile(r'Public Law \d+-\d+ \(\d+/\d+/\d+\)'))
-        if release_info:
-            match = re.search(r'Public Law (\d+-\d+) \((\d+/\d+/\d+)\)', release_info)
-            if match:
-                return {
-                    'public_law': match.group(1),
-                    'date': match.group(2)
-                }
+        if release:
+            try:
+                write_json_file(RELEASE_CACHE_FILE, {**validators, 'release': release})
+            except Exception as e:
+                logger.warning(f"Error saving release cache: {e}")
         
-        return None
+        return release
     except Exception as e:
         logger.error(f"Error getting current release point: {e}")
         return None
 
 def load_last_update_info():
     """Load information about the last update"""
-    info_file = Path("update_info.json")
-    if info_file.exists():
-        try:
-            with open(info_file, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading update info: {e}")
+    try:
+        if MSGPACK_AVAILABLE and UPDATE_INFO_FILE.exists():
+            return msgpack.unpackb(UPDATE_INFO_FILE.read_bytes(), raw=False)
+        # Legacy JSON file; it is migrated the next time the info is saved
+        if UPDATE_INFO_JSON_FILE.exists():
+            return read_json_file(UPDATE_INFO_JSON_FILE)
+    except Exception as e:
+        logger.error(f"Error loading update info: {e}")
     
     return {
         'last_update': None,
@@ -70,14 +198,42 @@ def load_last_update_info():
 
 def save_update_info(info):
     """Save information about the current update"""
-    info_file = Path("update_info.json")
     try:
-        with open(info_file, 'w') as f:
-            json.dump(info, f, indent=2)
+        if MSGPACK_AVAILABLE:
+            UPDATE_INFO_FILE.write_bytes(msgpack.packb(info, use_bin_type=True))
+            UPDATE_INFO_JSON_FILE.unlink(missing_ok=True)
+        else:
+            write_json_file(UPDATE_INFO_JSON_FILE, info)
         logger.info("Update info saved")
     except Exception as e:
         logger.error(f"Error saving update info: {e}")
 
+def download_title(downloader, title_num, url, release_info):
+    """Download the latest release of a title
+    
+    Args:
+        downloader (USCReleaseDownloader): Downloader to fetch the zip with
+        title_num (int): Title number
+        url (str): URL of the title's zip file
+        release_info (str): Release point of the download, e.g. "119-4"
+    
+    Returns:
+        Path: Path to the downloaded zip file, or None if the download failed
+    """
+    # Format title number with leading zeros
+    title_str = str(title_num).zfill(2)
+    
+    # Construct the output filename
+    output_filename = f"title{title_str}_{release_info}.zip"
+    
+    logger.info(f"Downloading Title {title_str} (Release {release_info})...")
+    success = downloader.download_ranged(url, output_filename, parts=RANGE_DOWNLOAD_PARTS)
+    if not success:
+        logger.error(f"Failed to download Title {title_str}")
+        return None
+    
+    return downloader.download_dir / output_filename
+
 def check_and_update():
     """Check for updates and process new releases if available"""
     logger.info("Checking for updates...")
@@ -101,7 +257,7 @@ def check_and_update():
     logger.info(f"New release available: {update_info['last_public_law']} -> {current_release['public_law']}")
     
     # Find all release points
-    all_releases = find_all_release_points()
+    all_releases = find_all_release_points(session=_SESSION)
     if not all_releases:
         logger.error("Failed to find release points")
         return False
@@ -112,46 +268,50 @@ def check_and_update():
     download_dir.mkdir(exist_ok=True)
     output_dir.mkdir(exist_ok=True)
     
-    downloader = USCReleaseDownloader(download_dir=str(download_dir))
-    processor = USCProcessor(download_dir=str(download_dir), output_dir=str(output_dir))
+    downloader = USCReleaseDownloader(download_dir=str(download_dir), session=_SESSION)
+    
+    # Resolve the latest release of every title up front
+    work = [
+        (title_num, all_releases[title_num][0]['url'], all_releases[title_num][0]['release'])
+        for title_num in sorted(all_releases)
+        if title_num not in SKIP_TITLES
+    ]
     
-    # Process each title
+    # Download titles concurrently and hand each one to a worker process as
+    # soon as it arrives, so XML parsing overlaps the remaining downloads
     processed_titles = []
-    for title_num in sorted(all_releases.keys()):
-        if title_num == 53:  # Skip title 53 as it's reserved
-            continue
-            
-        try:
-            # Get the latest release for this title
-            latest_release = all_releases[title_num][0]
-            release_info = latest_release['release']
-            url = latest_release['url']
-            
-            # Format title number with leading zeros
-            title_str = str(title_num).zfill(2)
-            
-            # Construct the output filename
-            output_filename = f"title{title_str}_{release_info}.zip"
-            output_path = download_dir / output_filename
-            
-            # Download the file
-            logger.info(f"Downloading Title {title_str} (Release {release_info})...")
-            success = downloader.download_from_direct_url(url, output_filename)
-            if not success:
-                logger.error(f"Failed to download Title {title_str}")
-                continue
-            
-            # Process the file
-            logger.info(f"Processing Title {title_str}...")
-            processor.process_zip_file(output_path)
-            
-            processed_titles.append(title_num)
-            
-            # Add a small delay between titles
-            time.sleep(1)
-            
-        except Exception as e:
-            logger.error(f"Error processing Title {title_num}: {e}")
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DOWNLOADS) as download_pool, \
+            ProcessPoolExecutor(max_workers=os.cpu_count()) as process_pool:
+        download_futures = {
+            download_pool.submit(download_title, downloader, title_num, url, release_info): title_num
+            for title_num, url, release_info in work
+        }
+        
+        process_futures = {}
+        for future in as_completed(download_futures):
+            title_num = download_futures[future]
+            try:
+                output_path = future.result()
+                if output_path is None:
+                    continue
+                
+                logger.info(f"Processing Title {str(title_num).zfill(2)}...")
+                process_futures[process_pool.submit(process_zip_worker, output_path, download_dir, output_dir)] = title_num
+                
+            except Exception as e:
+                logger.error(f"Error downloading Title {title_num}: {e}")
+        
+        for future in as_completed(process_futures):
+            title_num = process_futures[future]
+            try:
+                if future.result():
+                    processed_titles.append(title_num)
+                else:
+                    logger.error(f"Failed to process Title {title_num}")
+            except Exception as e:
+                logger.error(f"Error processing Title {title_num}: {e}")
+    
+    processed_titles.sort()
     
     # Verify the processed titles
     title_numbers, missing_titles, invalid_files = verify_titles()
@@ -3,31 +3,21 @@ import sys
 import time
 import os
 
+# Quiet, non-interactive pip invocation shared by every install
+PIP_INSTALL = f"{sys.executable} -m pip install --no-input --disable-pip-version-check --progress-bar off"
+
 def run_command(command):
     """Run a command and print the output"""
-    print(f"Running: {command}")
+    print(f"Running: {command}", flush=True)
     
     try:
-        process = subprocess.Popen(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            shell=True,
-            universal_newlines=True
-        )
-        
-        # Stream output
-        for line in process.stdout:
-            print(line.strip())
-        
-        # Wait for process to complete
-        process.wait()
+        # Let the command write straight to the terminal instead of relaying
+        # its output line by line through Python
+        result = subprocess.run(command, shell=True)
         
         # Check return code
-        if process.returncode != 0:
-            print(f"Command failed with return code {process.returncode}")
-            for line in process.stderr:
-                print(line.strip())
+        if result.returncode != 0:
+            print(f"Command failed with return code {result.returncode}")
             return False
         
         print(f"Command completed successfully")
@@ -37,6 +27,21 @@ def run_command(command):
         print(f"Error running command: {e}")
         return False
 
+def pip_install(requirements):
+    """Install a tier of requirements with one pip call
+    
+    If the batched install fails, each package is retried on its own so one
+    broken package doesn't block the rest of the tier.
+    
+    Returns:
+        list: Requirements that could not be installed
+    """
+    if run_command(f"{PIP_INSTALL} {' '.join(requirements)}"):
+        return []
+    
+    print("Batch install failed, retrying packages individually...")
+    return [req for req in requirements if not run_command(f"{PIP_INSTALL} {req}")]
+
 def install_requirements():
     """Install requirements incrementally"""
     # Basic requirements (should work on all systems)
@@ -58,27 +63,30 @@ def install_requirements():
     # Optional requirements (may be difficult to install)
     optional_requirements = [
         "scikit-learn",
-        "networkx"
+        "networkx",
+        "orjson",
+        "zlib-ng",
+        "msgpack",
+        "cdifflib",
+        "pyahocorasick",
+        "ijson"
     ]
     
     # Install basic requirements
     print("Installing basic requirements...")
-    for req in basic_requirements:
-        if not run_command(f"{sys.executable} -m pip install {req}"):
-            print(f"Failed to install {req}")
-            return False
+    for req in pip_install(basic_requirements):
+        print(f"Failed to install {req}")
+        return False
     
     # Install advanced requirements
     print("\nInstalling advanced requirements...")
-    for req in advanced_requirements:
-        if not run_command(f"{sys.executable} -m pip install {req}"):
-            print(f"Failed to install {req}, but continuing...")
+    for req in pip_install(advanced_requirements):
+        print(f"Failed to install {req}, but continuing...")
     
     # Install optional requirements
     print("\nInstalling optional requirements...")
-    for req in optional_requirements:
-        if not run_command(f"{sys.executable} -m pip install {req}"):
-            print(f"Failed to install {req}, but continuing...")
+    for req in pip_install(optional_requirements):
+        print(f"Failed to install {req}, but continuing...")
     
     return True
 
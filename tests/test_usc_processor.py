@@ -10,25 +10,12 @@ import xml.etree.ElementTree as ET
 # Import the USCProcessor class
 from usc_processor import USCProcessor
 
+# Real Title 1 download used by the end-to-end test when present
+TITLE1_ZIP = Path("downloads/title01.zip")
+
 class TestUSCProcessor(unittest.TestCase):
-    def setUp(self):
-        """Set up test environment before each test"""
-        # Create temporary directories for testing
-        self.test_download_dir = Path("test_downloads")
-        self.test_output_dir = Path("test_processed")
-        
-        # Create the directories
-        self.test_download_dir.mkdir(exist_ok=True)
-        self.test_output_dir.mkdir(exist_ok=True)
-        
-        # Initialize the processor with test directories
-        self.processor = USCProcessor(
-            download_dir=str(self.test_download_dir),
-            output_dir=str(self.test_output_dir)
-        )
-        
-        # Create a sample XML content for testing
-        self.sample_xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+    # Sample XML content shared by all tests
+    sample_xml_content = """<?xml version="1.0" encoding="UTF-8"?>
 <uscDoc xmlns="http://xml.house.gov/schemas/uslm/1.0" 
         xmlns:dc="http://purl.org/dc/elements/1.1/" 
         xmlns:dcterms="http://purl.org/dc/terms/">
@@ -62,14 +49,41 @@ class TestUSCProcessor(unittest.TestCase):
 </uscDoc>
 """
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary root directory and parse the sample XML once"""
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls._root = Path(cls._tmp.name)
+        
+        # Read-only parsed tree shared by the extraction tests
+        cls.sample_root = ET.fromstring(cls.sample_xml_content)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared temporary root directory"""
+        cls._tmp.cleanup()
+    
+    def setUp(self):
+        """Set up test environment before each test"""
+        # Create per-test directories under the shared temporary root
+        test_dir = self._root / self._testMethodName
+        self.test_download_dir = test_dir / "test_downloads"
+        self.test_output_dir = test_dir / "test_processed"
+        
+        # Create the directories
+        self.test_download_dir.mkdir(parents=True)
+        self.test_output_dir.mkdir()
+        
+        # Initialize the processor with test directories
+        self.processor = USCProcessor(
+            download_dir=str(self.test_download_dir),
+            output_dir=str(self.test_output_dir)
+        )
+    
     def tearDown(self):
         """Clean up after each test"""
-        # Remove test directories and their contents
-        if self.test_download_dir.exists():
-            shutil.rmtree(self.test_download_dir)
-        
-        if self.test_output_dir.exists():
-            shutil.rmtree(self.test_output_dir)
+        # Remove this test's directories; the root goes in tearDownClass
+        shutil.rmtree(self.test_download_dir.parent, ignore_errors=True)
     
     def create_test_xml_file(self, filename="sample.xml"):
         """Helper method to create a test XML file"""
@@ -100,8 +114,8 @@ class TestUSCProcessor(unittest.TestCase):
     
     def test_get_text(self):
         """Test the get_text method"""
-        # Parse the sample XML
-        root = ET.fromstring(self.sample_xml_content)
+        # Use the shared parsed sample XML
+        root = self.sample_root
         
         # Test with existing element
         title = self.processor.get_text(root.find('.//meta', self.processor.ns), './/dc:title')
@@ -113,8 +127,8 @@ class TestUSCProcessor(unittest.TestCase):
     
     def test_extract_metadata(self):
         """Test the extract_metadata method"""
-        # Parse the sample XML
-        root = ET.fromstring(self.sample_xml_content)
+        # Use the shared parsed sample XML
+        root = self.sample_root
         
         # Extract metadata
         metadata = self.processor.extract_metadata(root)
@@ -128,8 +142,8 @@ class TestUSCProcessor(unittest.TestCase):
     
     def test_extract_subsections(self):
         """Test the extract_subsections method"""
-        # Parse the sample XML
-        root = ET.fromstring(self.sample_xml_content)
+        # Use the shared parsed sample XML
+        root = self.sample_root
         
         # Find a section element
         section = root.find('.//section', self.processor.ns)
@@ -146,8 +160,8 @@ class TestUSCProcessor(unittest.TestCase):
     
     def test_extract_content(self):
         """Test the extract_content method"""
-        # Parse the sample XML
-        root = ET.fromstring(self.sample_xml_content)
+        # Use the shared parsed sample XML
+        root = self.sample_root
         
         # Extract content
         content = self.processor.extract_content(root)
@@ -236,15 +250,11 @@ class TestUSCProcessor(unittest.TestCase):
         self.assertFalse(zip_path1.exists())
         self.assertFalse(zip_path2.exists())
     
+    @unittest.skipUnless(TITLE1_ZIP.exists(), "Title 1 ZIP file not found. Run download_usc.py first.")
     def test_real_title1_processing(self):
         """Test processing the actual Title 1 file"""
-        # Check if the downloaded Title 1 file exists
-        title1_path = Path("downloads/title01.zip")
-        if not title1_path.exists():
-            self.skipTest("Title 1 ZIP file not found. Run download_usc.py first.")
-        
         # Copy the Title 1 file to the test downloads directory
-        shutil.copy(title1_path, self.test_download_dir / "title01.zip")
+        shutil.copy(TITLE1_ZIP, self.test_download_dir / "title01.zip")
         
         # Process the downloads
         self.processor.process_downloads()
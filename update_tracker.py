@@ -12,61 +12,226 @@ import logging
 import os
 import re
 import smtplib
-import difflib
+import sqlite3
+import fnmatch
+import html
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 from pathlib import Path
-import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 
-# Configure logging
-log_dir = Path("logs")
-log_dir.mkdir(exist_ok=True)
+# cdifflib's C SequenceMatcher is a drop-in for difflib's pure-Python one
+try:
+    from cdifflib import CSequenceMatcher as SequenceMatcher
+    CDIFFLIB_AVAILABLE = True
+except ImportError:
+    from difflib import SequenceMatcher
+    CDIFFLIB_AVAILABLE = False
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(log_dir / f'update_tracker_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
-    ]
-)
+# orjson parses and serialises the tracker's JSON files much faster
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
+from download_usc_releases import create_session, REQUEST_TIMEOUT
+
+# Logging is configured by the CLI below; when imported, records go to the
+# importing application's handlers
 logger = logging.getLogger('update_tracker')
 
+# Shared keep-alive session so repeated release checks reuse one connection
+_SESSION = create_session()
+
+# Release point text, e.g. "Public Law 119-4 (04/11/2025)", matched directly in
+# the raw page bytes; the str pattern is used on the unescaped text as a fallback
+RELEASE_POINT_BYTES_RE = re.compile(rb'Public Law (\d+-\d+) \((\d+/\d+/\d+)\)')
+RELEASE_POINT_RE = re.compile(r'Public\s+Law\s+(\d+-\d+)\s+\((\d+/\d+/\d+)\)')
+
+# Threads used to read legacy subscriber files; the work is I/O-bound
+SUBSCRIBER_LOAD_WORKERS = 16
+
+# Recipients per SMTP transaction; each batch is one DATA transfer with the
+# subscribers as blind (envelope-only) recipients
+NOTIFICATION_BATCH_SIZE = 50
+
+# Subscribers live in one SQLite table; title_numbers is a JSON array, or
+# NULL for a subscription to all titles
+SUBSCRIBERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscribers (
+    email TEXT PRIMARY KEY,
+    subscribed_at TEXT,
+    title_numbers TEXT,
+    active INTEGER NOT NULL DEFAULT 1,
+    unsubscribed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_subscribers_active ON subscribers (active);
+"""
+
+def load_json_file(path):
+    """Load a JSON file, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def section_lines(element):
+    """Flatten a processed section (or subsection, paragraph...) into text lines
+    
+    Each level contributes one line of "num heading content", so the diff
+    between two versions is computed line by line rather than character by
+    character.
+    
+    Args:
+        element (dict): Section dict from the processed title JSON
+        
+    Returns:
+        list: Lines of text
+    """
+    line = ' '.join(part for part in (element.get('num'), element.get('heading'), element.get('content')) if part)
+    lines = [line] if line else []
+    for key in ('subsections', 'paragraphs', 'subparagraphs'):
+        for child in element.get(key) or []:
+            lines.extend(section_lines(child))
+    return lines
+
+def title_sections(title_data):
+    """Map each section identifier in a processed title to the section dict"""
+    content = title_data.get('content') or {}
+    sections = {}
+    for chapter in content.get('chapters') or []:
+        for section in chapter.get('sections') or []:
+            sections[section.get('identifier') or section.get('num')] = section
+    for section in content.get('sections') or []:
+        sections[section.get('identifier') or section.get('num')] = section
+    return sections
+
+def save_json_file(path, data):
+    """Save data to a JSON file, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
 class USCodeUpdateTracker:
     """Tracks updates to the US Code and provides notification capabilities"""
     
-    def __init__(self, data_dir="update_data"):
+    def __init__(self, data_dir="update_data", session=None):
         """Initialize the update tracker
         
         Args:
             data_dir (str): Directory to store update data
+            session (requests.Session): Session for HTTP requests, defaults to a shared pooled session
         """
         self.data_dir = Path(data_dir)
+        self.session = session or _SESSION
         self.data_dir.mkdir(exist_ok=True)
         
         # Create subdirectories
         self.versions_dir = self.data_dir / "versions"
         self.changes_dir = self.data_dir / "changes"
+        self.subscribers_db = self.data_dir / "subscribers.sqlite"
+        # Legacy one-file-per-subscriber storage, migrated into the database
         self.subscribers_dir = self.data_dir / "subscribers"
         
         self.versions_dir.mkdir(exist_ok=True)
         self.changes_dir.mkdir(exist_ok=True)
-        self.subscribers_dir.mkdir(exist_ok=True)
+        self._init_subscribers_db()
+        
+        # Newest file per (directory, pattern), keyed on the directory's mtime
+        self._newest_file_cache = {}
+        
+        # Logged-in SMTP connection kept open between notification runs
+        self._smtp = None
+        self._smtp_settings = None
         
         # Load configuration
         self.config = self._load_config()
     
+    def _connect(self):
+        """Open a connection to the subscriber database
+        
+        A connection is opened per operation so the tracker can be shared
+        between web server threads.
+        """
+        db = sqlite3.connect(self.subscribers_db, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+    
+    def _init_subscribers_db(self):
+        """Create the subscriber database and migrate legacy subscriber files"""
+        with closing(self._connect()) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SUBSCRIBERS_SCHEMA)
+            
+            if not self.subscribers_dir.is_dir():
+                return
+            
+            with os.scandir(self.subscribers_dir) as it:
+                legacy_files = [entry.path for entry in it if entry.name.endswith(".json")]
+            if not legacy_files:
+                return
+            
+            try:
+                with ThreadPoolExecutor(max_workers=SUBSCRIBER_LOAD_WORKERS) as executor:
+                    subscriptions = list(executor.map(load_json_file, legacy_files))
+                
+                db.execute("BEGIN")
+                db.executemany(
+                    "INSERT OR IGNORE INTO subscribers VALUES (?, ?, ?, ?, ?)",
+                    [self._subscription_row(subscription) for subscription in subscriptions]
+                )
+                db.execute("COMMIT")
+            except Exception as e:
+                if db.in_transaction:
+                    db.execute("ROLLBACK")
+                logger.error(f"Error migrating subscriber files: {e}")
+                return
+            
+            # The files are only removed once they are safely in the database
+            for path in legacy_files:
+                os.remove(path)
+            logger.info(f"Migrated {len(legacy_files)} subscribers to {self.subscribers_db}")
+    
+    @staticmethod
+    def _subscription_row(subscription):
+        """Convert a subscription dict to a subscribers table row"""
+        title_numbers = subscription.get('title_numbers')
+        return (
+            subscription['email'],
+            subscription.get('subscribed_at'),
+            json.dumps(title_numbers) if title_numbers is not None else None,
+            1 if subscription.get('active', True) else 0,
+            subscription.get('unsubscribed_at')
+        )
+    
+    @staticmethod
+    def _subscription_from_row(row):
+        """Convert a subscribers table row to a subscription dict"""
+        subscription = {
+            "email": row['email'],
+            "subscribed_at": row['subscribed_at'],
+            "title_numbers": json.loads(row['title_numbers']) if row['title_numbers'] is not None else None,
+            "active": bool(row['active'])
+        }
+        if row['unsubscribed_at']:
+            subscription['unsubscribed_at'] = row['unsubscribed_at']
+        return subscription
+    
     def _load_config(self):
         """Load configuration from config file"""
         config_file = self.data_dir / "config.json"
         
         if config_file.exists():
             try:
-                with open(config_file, 'r') as f:
-                    return json.load(f)
+                return load_json_file(config_file)
             except Exception as e:
                 logger.error(f"Error loading config: {e}")
         
@@ -92,8 +257,7 @@ class USCodeUpdateTracker:
         }
         
         # Save default configuration
-        with open(config_file, 'w') as f:
-            json.dump(default_config, f, indent=2)
+        save_json_file(config_file, default_config)
         
         return default_config
     
@@ -102,8 +266,7 @@ class USCodeUpdateTracker:
         config_file = self.data_dir / "config.json"
         
         try:
-            with open(config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            save_json_file(config_file, self.config)
             logger.info("Configuration saved")
         except Exception as e:
             logger.error(f"Error saving config: {e}")
@@ -115,31 +278,33 @@ class USCodeUpdateTracker:
             dict: Release information or None if not found
         """
         try:
-            response = requests.get("https://uscode.house.gov/download/download.shtml")
+            response = self.session.get("https://uscode.house.gov/download/download.shtml", timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Look for the current release point information
-            release_info = soup.find(string=re.compile(r'Public Law \d+-\d+ \(\d+/\d+/\d+\)'))
-            if release_info:
-                match = re.search(r'Public Law (\d+-\d+) \((\d+/\d+/\d+)\)', release_info)
+            # Look for the current release point directly in the raw bytes
+            match = RELEASE_POINT_BYTES_RE.search(response.content)
+            if match:
+                public_law, date_str = match.group(1).decode(), match.group(2).decode()
+            else:
+                # Fall back to the decoded text in case it is written with
+                # character references (e.g. &nbsp;); no DOM is needed for a regex
+                match = RELEASE_POINT_RE.search(html.unescape(response.text))
                 if match:
-                    # Parse the date
-                    date_str = match.group(2)
-                    date_parts = date_str.split('/')
-                    if len(date_parts) == 3:
-                        month, day, year = date_parts
-                        formatted_date = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-                    else:
-                        formatted_date = date_str
-                    
-                    return {
-                        "public_law": match.group(1),
-                        "date": formatted_date,
-                        "raw_date": date_str,
-                        "timestamp": datetime.now().isoformat()
-                    }
+                    public_law, date_str = match.group(1), match.group(2)
+            
+            if match:
+                # Parse the date (MM/DD/YYYY) into ISO format
+                try:
+                    formatted_date = datetime.strptime(date_str, "%m/%d/%Y").date().isoformat()
+                except ValueError:
+                    formatted_date = date_str
+                
+                return {
+                    "public_law": public_law,
+                    "date": formatted_date,
+                    "raw_date": date_str,
+                    "timestamp": datetime.now().isoformat()
+                }
             
             logger.error("Could not find release information on the page")
             return None
@@ -163,12 +328,45 @@ class USCodeUpdateTracker:
         file_path = self.versions_dir / filename
         
         try:
-            with open(file_path, 'w') as f:
-                json.dump(release_info, f, indent=2)
+            save_json_file(file_path, release_info)
+            # Rewriting an existing file doesn't change the directory mtime
+            self._newest_file_cache.clear()
             logger.info(f"Release info saved to {file_path}")
         except Exception as e:
             logger.error(f"Error saving release info: {e}")
     
+    def _load_newest_file(self, directory, pattern):
+        """Load the most recently modified JSON file in a directory
+        
+        The result is cached until the directory's mtime changes, i.e. until
+        a file is added, removed or renamed.
+        
+        Args:
+            directory (Path): Directory to search
+            pattern (str): Glob pattern of the files to consider
+            
+        Returns:
+            dict: Contents of the newest file, or None if there are no files
+        """
+        dir_mtime = directory.stat().st_mtime_ns
+        cached = self._newest_file_cache.get((directory, pattern))
+        if cached and cached[0] == dir_mtime:
+            return cached[1]
+        
+        # scandir entries carry their own cached stat, unlike glob + Path.stat
+        with os.scandir(directory) as it:
+            entries = [(entry.stat().st_mtime, entry.path) for entry in it
+                       if fnmatch.fnmatch(entry.name, pattern) and entry.is_file()]
+        
+        data = None
+        if entries:
+            # Load the newest file
+            newest_path = max(entries)[1]
+            data = load_json_file(newest_path)
+        
+        self._newest_file_cache[(directory, pattern)] = (dir_mtime, data)
+        return data
+    
     def get_latest_saved_release(self):
         """Get the latest saved release information
         
@@ -176,24 +374,27 @@ class USCodeUpdateTracker:
             dict: Release information or None if not found
         """
         try:
-            # Get all release files
-            release_files = list(self.versions_dir.glob("release_*.json"))
-            
-            if not release_files:
+            release = self._load_newest_file(self.versions_dir, "release_*.json")
+            if release is None:
                 logger.info("No saved releases found")
-                return None
-            
-            # Sort by modification time (newest first)
-            release_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            
-            # Load the newest file
-            with open(release_files[0], 'r') as f:
-                return json.load(f)
+            return release
         
         except Exception as e:
             logger.error(f"Error getting latest saved release: {e}")
             return None
     
+    def get_latest_changelog(self):
+        """Get the most recently generated changelog
+        
+        Returns:
+            dict: Changelog information or None if not found
+        """
+        try:
+            return self._load_newest_file(self.changes_dir, "changelog_*.json")
+        except Exception as e:
+            logger.error(f"Error getting latest changelog: {e}")
+            return None
+    
     def is_new_release_available(self):
         """Check if a new release is available
         
@@ -223,12 +424,16 @@ class USCodeUpdateTracker:
         logger.info("No new release available")
         return False, current_release, previous_release
     
-    def generate_changelog(self, current_release, previous_release):
+    def generate_changelog(self, current_release, previous_release, previous_dir=None, current_dir=None):
         """Generate a changelog between two releases
         
         Args:
             current_release (dict): Current release information
             previous_release (dict): Previous release information
+            previous_dir (str): Directory with the processed title JSON of the previous
+                release (e.g. a backup); section-level changes are listed when given
+                together with current_dir
+            current_dir (str): Directory with the processed title JSON of the current release
             
         Returns:
             dict: Changelog information
@@ -246,8 +451,7 @@ class USCodeUpdateTracker:
             "changes": []
         }
         
-        # In a real implementation, we would analyze the actual content changes
-        # For now, we'll just create a placeholder
+        # Summary of the release change
         changelog["changes"].append({
             "type": "update",
             "description": f"Updated from Public Law {previous_release['public_law']} to {current_release['public_law']}",
@@ -256,18 +460,119 @@ class USCodeUpdateTracker:
                       f"({current_release['raw_date']})."
         })
         
+        # Section-level changes from the processed text of both releases
+        if previous_dir and current_dir:
+            content_changes = self.compare_processed_titles(Path(previous_dir), Path(current_dir))
+            max_entries = self.config['changelog']['max_entries']
+            if len(content_changes) > max_entries:
+                logger.info(f"Changelog truncated to {max_entries} of {len(content_changes)} section changes")
+            changelog["changes"].extend(content_changes[:max_entries])
+        
         # Save the changelog
         changelog_file = self.changes_dir / f"changelog_{previous_release['public_law'].replace('-', '_')}_to_{current_release['public_law'].replace('-', '_')}.json"
         
         try:
-            with open(changelog_file, 'w') as f:
-                json.dump(changelog, f, indent=2)
+            save_json_file(changelog_file, changelog)
+            # Rewriting an existing file doesn't change the directory mtime
+            self._newest_file_cache.clear()
             logger.info(f"Changelog saved to {changelog_file}")
         except Exception as e:
             logger.error(f"Error saving changelog: {e}")
         
         return changelog
     
+    def compare_processed_titles(self, previous_dir, current_dir):
+        """Compare the processed titles of two releases section by section
+        
+        Args:
+            previous_dir (Path): Directory with the previous release's usc*.json files
+            current_dir (Path): Directory with the current release's usc*.json files
+            
+        Returns:
+            list: Change entries for added, removed and modified sections
+        """
+        include_details = self.config['changelog']['include_details']
+        changes = []
+        
+        title_files = sorted({path.name for path in previous_dir.glob("usc*.json")} |
+                             {path.name for path in current_dir.glob("usc*.json")})
+        for filename in title_files:
+            try:
+                old_sections = title_sections(load_json_file(previous_dir / filename)) if (previous_dir / filename).exists() else {}
+                new_sections = title_sections(load_json_file(current_dir / filename)) if (current_dir / filename).exists() else {}
+            except Exception as e:
+                logger.error(f"Error loading {filename} for comparison: {e}")
+                continue
+            
+            for identifier, new_section in new_sections.items():
+                old_section = old_sections.get(identifier)
+                label = f"{new_section.get('num', '')} {new_section.get('heading', '')}".strip()
+                if old_section is None:
+                    changes.append({
+                        "type": "added",
+                        "description": f"Added {label}",
+                        "details": f"New section {identifier}."
+                    })
+                    continue
+                
+                # Most sections don't change between releases; plain equality
+                # rules them out before any lines are built or matched
+                if old_section == new_section:
+                    continue
+                
+                change = self._diff_section(f"Modified {label}", section_lines(old_section),
+                                            section_lines(new_section), include_details)
+                if change:
+                    changes.append(change)
+            
+            for identifier, old_section in old_sections.items():
+                if identifier not in new_sections:
+                    label = f"{old_section.get('num', '')} {old_section.get('heading', '')}".strip()
+                    changes.append({
+                        "type": "removed",
+                        "description": f"Removed {label}",
+                        "details": f"Section {identifier} is no longer present."
+                    })
+        
+        return changes
+    
+    def _diff_section(self, description, old_lines, new_lines, include_details=True):
+        """Line-level diff of one section's text
+        
+        Args:
+            description (str): Description for the change entry
+            old_lines (list): Lines of the previous version
+            new_lines (list): Lines of the current version
+            include_details (bool): Include the changed lines in the entry
+            
+        Returns:
+            dict: Change entry, or None if the text is unchanged
+        """
+        # Only structural fields (e.g. identifiers) may differ; skip the matcher
+        if old_lines == new_lines:
+            return None
+        
+        # Legal text repeats boilerplate lines a lot; don't let autojunk drop them
+        matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        removed, added = [], []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                continue
+            removed.extend(old_lines[i1:i2])
+            added.extend(new_lines[j1:j2])
+        
+        if not removed and not added:
+            return None
+        
+        change = {
+            "type": "modified",
+            "description": description,
+            "details": f"{len(added)} lines added, {len(removed)} lines removed."
+        }
+        if include_details:
+            change["diff"] = [f"- {line}" for line in removed] + [f"+ {line}" for line in added]
+        return change
+    
     def subscribe_to_updates(self, email, title_numbers=None):
         """Subscribe to updates for specific titles or all titles
         
@@ -282,9 +587,6 @@ class USCodeUpdateTracker:
             logger.error(f"Invalid email address: {email}")
             return False
         
-        # Create a subscriber file
-        subscriber_file = self.subscribers_dir / f"{email.replace('@', '_at_')}.json"
-        
         subscription = {
             "email": email,
             "subscribed_at": datetime.now().isoformat(),
@@ -293,8 +595,12 @@ class USCodeUpdateTracker:
         }
         
         try:
-            with open(subscriber_file, 'w') as f:
-                json.dump(subscription, f, indent=2)
+            # Re-subscribing replaces the previous subscription
+            with closing(self._connect()) as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO subscribers VALUES (?, ?, ?, ?, ?)",
+                    self._subscription_row(subscription)
+                )
             logger.info(f"Subscription saved for {email}")
             return True
         except Exception as e:
@@ -314,25 +620,17 @@ class USCodeUpdateTracker:
             logger.error(f"Invalid email address: {email}")
             return False
         
-        # Find the subscriber file
-        subscriber_file = self.subscribers_dir / f"{email.replace('@', '_at_')}.json"
-        
-        if not subscriber_file.exists():
-            logger.error(f"No subscription found for {email}")
-            return False
-        
         try:
-            # Load the subscription
-            with open(subscriber_file, 'r') as f:
-                subscription = json.load(f)
-            
             # Mark as inactive
-            subscription['active'] = False
-            subscription['unsubscribed_at'] = datetime.now().isoformat()
+            with closing(self._connect()) as db:
+                cursor = db.execute(
+                    "UPDATE subscribers SET active = 0, unsubscribed_at = ? WHERE email = ?",
+                    (datetime.now().isoformat(), email)
+                )
             
-            # Save the updated subscription
-            with open(subscriber_file, 'w') as f:
-                json.dump(subscription, f, indent=2)
+            if cursor.rowcount == 0:
+                logger.error(f"No subscription found for {email}")
+                return False
             
             logger.info(f"Unsubscribed {email}")
             return True
@@ -350,29 +648,20 @@ class USCodeUpdateTracker:
         Returns:
             list: List of subscriber dictionaries
         """
-        subscribers = []
-        
         try:
-            # Get all subscriber files
-            subscriber_files = list(self.subscribers_dir.glob("*.json"))
-            
-            for file in subscriber_files:
-                with open(file, 'r') as f:
-                    subscription = json.load(f)
-                
-                # Check if active
-                if not subscription.get('active', True):
-                    continue
-                
-                # Check if subscribed to the specified title
-                if title_number is not None:
-                    title_numbers = subscription.get('title_numbers')
-                    if title_numbers is not None and title_number not in title_numbers:
-                        continue
-                
-                subscribers.append(subscription)
+            with closing(self._connect()) as db:
+                if title_number is None:
+                    rows = db.execute("SELECT * FROM subscribers WHERE active = 1").fetchall()
+                else:
+                    # Subscribers to all titles, or whose title list includes this one
+                    rows = db.execute(
+                        "SELECT * FROM subscribers WHERE active = 1 AND ("
+                        "title_numbers IS NULL OR "
+                        "EXISTS (SELECT 1 FROM json_each(subscribers.title_numbers) WHERE value = ?))",
+                        (title_number,)
+                    ).fetchall()
             
-            return subscribers
+            return [self._subscription_from_row(row) for row in rows]
         
         except Exception as e:
             logger.error(f"Error getting active subscribers: {e}")
@@ -483,44 +772,127 @@ To unsubscribe from these notifications, please reply to this email with "UNSUBS
         
         try:
             # Connect to SMTP server
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls()
-            server.login(username, password)
+            server = self._get_smtp_connection(smtp_server, smtp_port, username, password)
+            
+            # Build and serialize the message once. It is addressed to the
+            # sender and subscribers only appear as envelope recipients (BCC),
+            # so one copy can be delivered to a whole batch
+            msg = MIMEMultipart('alternative')
+            msg['Subject'] = subject
+            msg['From'] = from_address
+            msg['To'] = from_address
+            msg.attach(MIMEText(text_content, 'plain'))
+            msg.attach(MIMEText(html_content, 'html'))
+            message_bytes = msg.as_bytes()
             
-            for subscriber in subscribers:
+            recipients = [subscriber['email'] for subscriber in subscribers]
+            for start in range(0, len(recipients), NOTIFICATION_BATCH_SIZE):
+                batch = recipients[start:start + NOTIFICATION_BATCH_SIZE]
                 try:
-                    # Create message
-                    msg = MIMEMultipart('alternative')
-                    msg['Subject'] = subject
-                    msg['From'] = from_address
-                    msg['To'] = subscriber['email']
-                    
-                    # Attach parts
-                    part1 = MIMEText(text_content, 'plain')
-                    part2 = MIMEText(html_content, 'html')
-                    msg.attach(part1)
-                    msg.attach(part2)
-                    
-                    # Send email
-                    server.sendmail(from_address, subscriber['email'], msg.as_string())
-                    notifications_sent += 1
-                    logger.info(f"Notification sent to {subscriber['email']}")
-                
+                    # Send email; refused recipients don't stop the rest of the batch
+                    try:
+                        refused = server.sendmail(from_address, batch, message_bytes)
+                    except smtplib.SMTPServerDisconnected:
+                        # The server dropped the connection; reconnect and retry once
+                        self._smtp = None
+                        server = self._get_smtp_connection(smtp_server, smtp_port, username, password)
+                        refused = server.sendmail(from_address, batch, message_bytes)
+                except smtplib.SMTPRecipientsRefused as e:
+                    refused = e.recipients
                 except Exception as e:
-                    logger.error(f"Error sending notification to {subscriber['email']}: {e}")
-            
-            # Close connection
-            server.quit()
+                    logger.error(f"Error sending notifications to {len(batch)} subscribers: {e}")
+                    continue
+                
+                for email, error in refused.items():
+                    logger.error(f"Error sending notification to {email}: {error}")
+                
+                notifications_sent += len(batch) - len(refused)
+                logger.info(f"Notification sent to {len(batch) - len(refused)} subscribers")
             
         except Exception as e:
             logger.error(f"Error connecting to SMTP server: {e}")
+            self.close()
         
         return notifications_sent
+    
+    def connect_smtp(self):
+        """Open the SMTP connection from the configured settings ahead of sending
+        
+        send_update_notification reuses the open connection, so this lets
+        callers overlap the handshake with other work.
+        
+        Returns:
+            bool: True if a connection is open
+        """
+        email_config = self.config['email_notifications']
+        if not email_config['enabled'] or not all(
+                email_config[key] for key in ('smtp_server', 'username', 'password', 'from_address')):
+            return False
+        
+        try:
+            self._get_smtp_connection(email_config['smtp_server'], email_config['smtp_port'],
+                                      email_config['username'], email_config['password'])
+            return True
+        except Exception as e:
+            logger.error(f"Error connecting to SMTP server: {e}")
+            return False
+    
+    def _get_smtp_connection(self, smtp_server, smtp_port, username, password):
+        """Return a logged-in SMTP connection, reusing the open one when possible
+        
+        Reusing the connection skips the TCP, STARTTLS and AUTH round trips on
+        repeated notification runs.
+        
+        Returns:
+            smtplib.SMTP: Connected and authenticated SMTP client
+        """
+        settings = (smtp_server, smtp_port, username)
+        if self._smtp is not None:
+            if self._smtp_settings == settings:
+                try:
+                    self._smtp.noop()
+                    return self._smtp
+                except (smtplib.SMTPException, OSError):
+                    pass
+            self.close()
+        
+        server = smtplib.SMTP(smtp_server, smtp_port)
+        server.starttls()
+        # Refresh the advertised extensions (PIPELINING, AUTH, ...) after TLS
+        server.ehlo()
+        server.login(username, password)
+        
+        self._smtp = server
+        self._smtp_settings = settings
+        return server
+    
+    def close(self):
+        """Close the SMTP connection if one is open"""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+            self._smtp_settings = None
 
 # Command-line interface
 if __name__ == "__main__":
     import argparse
     
+    # Configure logging
+    log_dir = Path("logs")
+    log_dir.mkdir(exist_ok=True)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(),
+            logging.FileHandler(log_dir / f'update_tracker_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
+        ]
+    )
+    
     parser = argparse.ArgumentParser(description='US Code Update Tracker')
     parser.add_argument('--check', action='store_true', help='Check for updates')
     parser.add_argument('--subscribe', metavar='EMAIL', help='Subscribe to updates')
@@ -575,21 +947,22 @@ if __name__ == "__main__":
             print("No saved releases found")
             exit(1)
         
-        # Find the latest changelog file
-        changelog_files = list(tracker.changes_dir.glob("changelog_*.json"))
-        if not changelog_files:
+        # Load the newest changelog and the subscribers while the SMTP
+        # connection is being set up; all three wait on I/O
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            changelog_future = executor.submit(tracker.get_latest_changelog)
+            subscribers_future = executor.submit(tracker.get_active_subscribers)
+            executor.submit(tracker.connect_smtp)
+        
+        changelog = changelog_future.result()
+        if not changelog:
+            tracker.close()
             print("No changelog files found")
             exit(1)
         
-        # Sort by modification time (newest first)
-        changelog_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-        
-        # Load the newest changelog
-        with open(changelog_files[0], 'r') as f:
-            changelog = json.load(f)
-        
         # Send notifications
-        count = tracker.send_update_notification(changelog)
+        count = tracker.send_update_notification(changelog, subscribers_future.result())
+        tracker.close()
         print(f"Sent {count} notifications")
     
     elif args.config:
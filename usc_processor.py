@@ -1,14 +1,61 @@
-import xml.etree.ElementTree as ET
 import json
 import zipfile
 import re
 from pathlib import Path
-import shutil
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
 import traceback
 import sys
 import os
 
+# Prefer lxml (libxml2) for parsing; fall back to the standard library
+try:
+    from lxml import etree as ET
+    LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    LXML_AVAILABLE = False
+
+# orjson is much faster at serialising the large per-title dicts
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# zlib-ng inflates the large XML members noticeably faster than stock zlib;
+# zipfile resolves its zlib module and crc32 at call time, so swap them in
+try:
+    from zlib_ng import zlib_ng
+    zipfile.zlib = zlib_ng
+    zipfile.crc32 = zlib_ng.crc32
+    ZLIB_NG_AVAILABLE = True
+except ImportError:
+    ZLIB_NG_AVAILABLE = False
+
+# Clark-notation tags, resolved once so hot loops skip ElementPath prefix parsing
+USLM_NS = 'http://xml.house.gov/schemas/uslm/1.0'
+USLM_CHAPTER_TAG = f'{{{USLM_NS}}}chapter'
+USLM_SECTION_TAG = f'{{{USLM_NS}}}section'
+USLM_SUBSECTION_TAG = f'{{{USLM_NS}}}subsection'
+USLM_PARAGRAPH_TAG = f'{{{USLM_NS}}}paragraph'
+USLM_SUBPARAGRAPH_TAG = f'{{{USLM_NS}}}subparagraph'
+
+# get_text paths of the form './/prefix:name' can be compiled to a first-match XPath
+SIMPLE_DESCENDANT_PATH_RE = re.compile(r'^\.//([\w-]+:)?[\w-]+$')
+# Namespace prefixes in a path, expanded to Clark notation for ElementPath
+PATH_PREFIX_RE = re.compile(r'([\w-]+):')
+
+# Standard title zip: title01.zip or title01_119-4.zip
+TITLE_ZIP_RE = re.compile(r'title(\d+)(?:_(\d+-\d+))?\.zip')
+# Release point zip: xml_usc01@119-4.zip
+RELEASE_ZIP_RE = re.compile(r'xml_usc(\d+)@(\d+-\d+)\.zip')
+# Release point in a docPublicationName such as "Online@119-4"
+PUBLICATION_RELEASE_RE = re.compile(r'@(\d+-\d+)')
+# Title number in a document identifier such as "/us/usc/t1" or "usc01"
+USC_IDENTIFIER_RE = re.compile(r'usc(\d+)')
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -40,6 +87,13 @@ class ZipExtractionError(USCProcessorError):
     pass
 
 class USCProcessor:
+    # Compiled lxml XPath objects and Clark-expanded ElementPath strings keyed
+    # by path string. The namespace map below is the same for every instance,
+    # so these are shared on the class and survive the per-zip processors
+    # created in worker processes.
+    _xpath_cache = {}
+    _clark_paths = {}
+
     def __init__(self, download_dir="downloads", output_dir="processed"):
         self.download_dir = Path(download_dir)
         self.output_dir = Path(output_dir)
@@ -51,8 +105,14 @@ class USCProcessor:
         # Use the module logger
         self.logger = logger
 
-    def process_downloads(self):
-        """Process all USC zip files in download directory"""
+    def process_downloads(self, max_workers=None):
+        """Process all USC zip files in download directory
+
+        Archives are processed in parallel worker processes.
+
+        Args:
+            max_workers (int): Number of worker processes (defaults to the CPU count)
+        """
         self.download_dir.mkdir(exist_ok=True)
         self.output_dir.mkdir(exist_ok=True)
 
@@ -60,70 +120,121 @@ class USCProcessor:
         zip_files = list(self.download_dir.glob('*.zip'))
         self.logger.info(f"Found {len(zip_files)} zip files")
 
-        for zip_file in zip_files:
-            self.logger.info(f"Processing {zip_file}")
-            self.process_zip_file(zip_file)
+        if not zip_files:
+            return
 
-    def process_zip_file(self, zip_path):
+        successful = 0
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            futures = {
+                executor.submit(process_zip_worker, zip_file, self.download_dir, self.output_dir): zip_file
+                for zip_file in zip_files
+            }
+            # Log archives as they finish rather than in submission order
+            for future in as_completed(futures):
+                zip_file = futures[future]
+                try:
+                    if future.result():
+                        successful += 1
+                    else:
+                        self.logger.error(f"Failed to process {zip_file.name}")
+                except Exception as e:
+                    self.logger.error(f"Worker failed on {zip_file.name}: {e}")
+
+        self.logger.info(f"Successfully processed {successful} out of {len(zip_files)} zip files")
+
+    def process_zip_file(self, zip_path, max_workers=None):
         """Extract and process a single USC zip file
 
         Args:
             zip_path (Path): Path to the zip file to process
+            max_workers (int): Worker processes for archives holding several
+                XML files (defaults to the CPU count, 1 keeps it serial)
 
         Raises:
             ZipExtractionError: If there's an error extracting the zip file
             XMLParsingError: If there's an error parsing the XML files
         """
+        try:
+            zip_ref = zipfile.ZipFile(zip_path, 'r')
+        except zipfile.BadZipFile as e:
+            self.logger.error(f"Invalid zip file {zip_path}: {e}")
+            return False
+        except PermissionError as e:
+            self.logger.error(f"Permission denied when opening {zip_path}: {e}")
+            return False
+        except Exception as e:
+            self.logger.error(f"Error opening {zip_path}: {e}")
+            return False
+
+        with zip_ref:
+            return self.process_zip_archive(zip_ref, max_workers=max_workers)
+
+    def process_zip_archive(self, zip_ref, name=None, max_workers=1):
+        """Process the XML members of an already-open USC zip archive
+
+        Lets callers that have already opened (and possibly validated) the
+        archive hand it over without the processor opening it a second time.
+
+        Args:
+            zip_ref (zipfile.ZipFile): Open zip archive to process
+            name (str): Archive filename, defaults to the archive's own filename
+            max_workers (int): Worker processes for archives holding several
+                XML files (None uses the CPU count, 1 keeps it serial)
+
+        Raises:
+            ZipExtractionError: If there's an error extracting the zip file
+            XMLParsingError: If there's an error parsing the XML files
+        """
+        zip_path = Path(name or zip_ref.filename or 'archive.zip')
+
         # Make sure output directory exists
         self.output_dir.mkdir(exist_ok=True)
 
-        # Create temp directory for extraction
-        temp_dir = self.output_dir / 'temp'
-        temp_dir.mkdir(exist_ok=True)
-
         try:
-            # Extract zip file
+            # List the XML members; they are parsed straight out of the archive
+            # so nothing is extracted to disk
             try:
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    # List all files in the zip
-                    file_list = zip_ref.namelist()
-                    self.logger.info(f"Zip contains {len(file_list)} files")
-
-                    # Extract all files
-                    zip_ref.extractall(temp_dir)
+                members = zip_ref.infolist()
+                self.logger.info(f"Zip contains {len(members)} files")
+                xml_members = [info for info in members
+                               if not info.is_dir() and info.filename.endswith('.xml')]
             except zipfile.BadZipFile as e:
                 raise ZipExtractionError(f"Invalid zip file {zip_path}: {e}") from e
-            except PermissionError as e:
-                raise ZipExtractionError(f"Permission denied when extracting {zip_path}: {e}") from e
             except Exception as e:
-                raise ZipExtractionError(f"Error extracting {zip_path}: {e}") from e
+                raise ZipExtractionError(f"Error reading {zip_path}: {e}") from e
 
-            # Process all XML files (including those in subdirectories)
-            xml_files = list(temp_dir.glob('**/*.xml'))
-            self.logger.info(f"Found {len(xml_files)} XML files")
+            self.logger.info(f"Found {len(xml_members)} XML files")
 
-            if not xml_files:
+            if not xml_members:
                 self.logger.warning(f"No XML files found in {zip_path}")
 
-            successful_files = 0
-            for xml_file in xml_files:
-                try:
-                    self.logger.info(f"Processing XML file: {xml_file.name}")
-                    self.process_xml_file(xml_file)
-                    successful_files += 1
-                except XMLParsingError as e:
-                    self.logger.error(f"XML parsing error in {xml_file}: {e}")
-                except EncodingError as e:
-                    self.logger.error(f"Encoding error in {xml_file}: {e}")
-                except Exception as e:
-                    self.logger.error(f"Unexpected error processing {xml_file}: {e}")
-                    self.logger.debug(f"Traceback: {traceback.format_exc()}")
+            # Members are independent, so archives holding several XML files
+            # (e.g. the all-titles bundle) are parsed in parallel; each worker
+            # reopens the archive by path since ZipFile objects don't pickle
+            workers = min(max_workers or os.cpu_count() or 1, len(xml_members))
+            archive_path = zip_ref.filename
+            if workers > 1 and archive_path and os.path.isfile(archive_path):
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = {
+                        executor.submit(process_xml_member_worker, archive_path, info.filename,
+                                        self.download_dir, self.output_dir): Path(info.filename)
+                        for info in xml_members
+                    }
+                    results = ((futures[future], future) for future in as_completed(futures))
+                    successful_files = sum(self._member_succeeded(xml_file, future.result)
+                                           for xml_file, future in results)
+            else:
+                successful_files = sum(
+                    self._member_succeeded(Path(info.filename),
+                                           partial(self._process_zip_member, zip_ref, info))
+                    for info in xml_members
+                )
 
             # Extract title and release information from zip filename
             title_info = self.extract_title_info(zip_path.name)
             if title_info:
                 self.logger.info(f"Processed Title {title_info['title']} (Release {title_info['release']})")
-                self.logger.info(f"Successfully processed {successful_files} out of {len(xml_files)} XML files")
+                self.logger.info(f"Successfully processed {successful_files} out of {len(xml_members)} XML files")
 
             # Keep the zip file for reference
             # zip_path.unlink()
@@ -136,24 +247,13 @@ class USCProcessor:
             self.logger.error(f"Unexpected error processing zip file {zip_path}: {e}")
             self.logger.debug(f"Traceback: {traceback.format_exc()}")
             return False
-        finally:
-            # Cleanup temp directory
-            try:
-                shutil.rmtree(temp_dir)
-            except Exception as e:
-                self.logger.warning(f"Error cleaning up temp directory {temp_dir}: {e}")
 
         return True
 
     def extract_title_info(self, filename):
         """Extract title number and release information from filename"""
-        # Pattern for standard title zip: title01.zip or title01_119-4.zip
-        title_pattern = re.compile(r'title(\d+)(?:_(\d+-\d+))?\.zip')
-        # Pattern for release point zip: xml_usc01@119-4.zip
-        release_pattern = re.compile(r'xml_usc(\d+)@(\d+-\d+)\.zip')
-
-        title_match = title_pattern.match(filename)
-        release_match = release_pattern.match(filename)
+        title_match = TITLE_ZIP_RE.match(filename)
+        release_match = RELEASE_ZIP_RE.match(filename)
 
         if title_match:
             title_num = title_match.group(1)
@@ -166,11 +266,37 @@ class USCProcessor:
 
         return None
 
-    def process_xml_file(self, xml_path):
+    def _process_zip_member(self, zip_ref, info):
+        """Parse one XML member straight out of an open archive"""
+        self.logger.info(f"Processing XML file: {Path(info.filename).name}")
+        with zip_ref.open(info) as xml_stream:
+            self.process_xml_file(Path(info.filename), source=xml_stream)
+
+    def _member_succeeded(self, xml_file, process):
+        """Run (or collect) one member's processing and log any failure
+
+        Returns:
+            bool: True if the member was processed successfully
+        """
+        try:
+            process()
+            return True
+        except XMLParsingError as e:
+            self.logger.error(f"XML parsing error in {xml_file}: {e}")
+        except EncodingError as e:
+            self.logger.error(f"Encoding error in {xml_file}: {e}")
+        except Exception as e:
+            self.logger.error(f"Unexpected error processing {xml_file}: {e}")
+            self.logger.debug(f"Traceback: {traceback.format_exc()}")
+        return False
+
+    def process_xml_file(self, xml_path, source=None):
         """Convert single XML file to JSON structure
 
         Args:
             xml_path (Path): Path to the XML file to process
+            source (file): Open binary stream to parse instead of reading
+                xml_path, e.g. a member opened from a zip archive
 
         Raises:
             XMLParsingError: If there's an error parsing the XML file
@@ -178,8 +304,9 @@ class USCProcessor:
         """
         try:
             try:
-                tree = ET.parse(xml_path)
-                root = tree.getroot()
+                # The parser pulls the file (or zip stream) in small blocks itself,
+                # so the XML is never read into one bytes buffer or mmap'd copy
+                root, chapters = self.iterparse_chapters(str(xml_path) if source is None else source)
             except ET.ParseError as e:
                 raise XMLParsingError(f"Error parsing XML file {xml_path}: {e}") from e
             except UnicodeDecodeError as e:
@@ -198,7 +325,7 @@ class USCProcessor:
 
             # Extract main content
             try:
-                content = self.extract_content(root)
+                content = self.extract_content(root, chapters=chapters)
             except Exception as e:
                 self.logger.warning(f"Error extracting content from {xml_path}: {e}")
                 content = {"title": {}, "chapters": [], "sections": []}
@@ -210,7 +337,7 @@ class USCProcessor:
             }
 
             # Create a more descriptive filename
-            title_match = re.search(r'usc(\d+)', metadata.get('identifier', ''))
+            title_match = USC_IDENTIFIER_RE.search(metadata.get('identifier', ''))
             if title_match:
                 title_num = title_match.group(1)
                 # Use a more descriptive filename including the title number
@@ -222,8 +349,12 @@ class USCProcessor:
             # Save as JSON
             json_path = self.output_dir / json_filename
             try:
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(usc_data, f, indent=2)
+                if ORJSON_AVAILABLE:
+                    with open(json_path, 'wb') as f:
+                        f.write(orjson.dumps(usc_data, option=orjson.OPT_INDENT_2))
+                else:
+                    with open(json_path, 'w', encoding='utf-8') as f:
+                        json.dump(usc_data, f, indent=2)
                 self.logger.info(f"Saved JSON to {json_path}")
             except Exception as e:
                 self.logger.error(f"Error saving JSON to {json_path}: {e}")
@@ -237,12 +368,55 @@ class USCProcessor:
             self.logger.debug(f"Traceback: {traceback.format_exc()}")
             raise XMLParsingError(f"Unexpected error processing {xml_path}: {e}") from e
 
+    def iterparse_chapters(self, source):
+        """Parse a USC XML file in a single pass, converting each chapter as it is read
+
+        Every chapter is turned into its dict as soon as its end tag is
+        parsed and then cleared, so the full DOM of a large title is never
+        held in memory at once. What is left of the tree afterwards is just
+        the metadata, the title heading and any sections outside chapters.
+
+        Args:
+            source (str or file): Filename or open binary stream to parse
+
+        Returns:
+            tuple: (root element, list of chapter dicts)
+        """
+        if LXML_AVAILABLE:
+            # USC documents are never queried by xml:id, so skip building the ID table
+            context = ET.iterparse(source, events=('end',), tag=USLM_CHAPTER_TAG,
+                                   huge_tree=True, collect_ids=False)
+        else:
+            # The standard library cannot filter by tag, so skip other elements here
+            context = ET.iterparse(source, events=('end',))
+
+        chapters = []
+        for _, element in context:
+            if element.tag != USLM_CHAPTER_TAG:
+                continue
+            try:
+                chapters.append(self.extract_chapter(element))
+            except Exception as e:
+                self.logger.error(f"Error extracting chapter data: {e}")
+            # The emptied element stays behind as a placeholder in the tree
+            element.clear()
+            if LXML_AVAILABLE:
+                # Drop the placeholders of chapters converted earlier so a
+                # title with hundreds of chapters doesn't keep them all;
+                # only chapters go, the heading and loose sections are read later
+                previous = element.getprevious()
+                while previous is not None and previous.tag == USLM_CHAPTER_TAG:
+                    element.getparent().remove(previous)
+                    previous = element.getprevious()
+
+        return context.root, chapters
+
     def extract_metadata(self, root):
         """Extract metadata from USC XML"""
         # Get the root identifier attribute if available
         root_identifier = root.get('identifier', '')
 
-        meta = root.find('.//uslm:meta', self.ns)
+        meta = self.find_first(root, './/uslm:meta')
         if meta is None:
             self.logger.warning("No metadata element found in XML")
             # Create basic metadata from root attributes
@@ -272,28 +446,36 @@ class USCProcessor:
 
         # Extract release information from publication name
         if pub_name and '@' in pub_name:
-            release_match = re.search(r'@(\d+-\d+)', pub_name)
+            release_match = PUBLICATION_RELEASE_RE.search(pub_name)
             if release_match:
                 metadata["release"] = release_match.group(1)
 
         # Add additional metadata if available
-        if self.get_text(meta, './/dc:description'):
-            metadata["description"] = self.get_text(meta, './/dc:description')
+        description = self.get_text(meta, './/dc:description')
+        if description:
+            metadata["description"] = description
 
-        if self.get_text(meta, './/dc:date'):
-            metadata["date"] = self.get_text(meta, './/dc:date')
+        date = self.get_text(meta, './/dc:date')
+        if date:
+            metadata["date"] = date
 
         return metadata
 
-    def extract_content(self, root):
-        """Extract main content structure from USC XML"""
-        main = root.find('.//uslm:main', self.ns)
+    def extract_content(self, root, chapters=None):
+        """Extract main content structure from USC XML
+
+        Args:
+            root (Element): Root element of the parsed document
+            chapters (list): Chapter dicts already extracted while parsing, or
+                None to extract them from the tree
+        """
+        main = self.find_first(root, './/uslm:main')
         if main is None:
             self.logger.warning("No main element found in XML")
             return {}
 
         # Extract title information
-        title_element = main.find('.//uslm:title', self.ns)
+        title_element = self.find_first(main, './/uslm:title')
         if title_element is not None:
             title_info = {
                 "num": self.get_text(title_element, './/uslm:num'),
@@ -306,53 +488,23 @@ class USCProcessor:
             self.logger.warning("No title element found in XML")
 
         # Extract chapters
-        chapters = []
-        chapter_elements = main.findall('.//uslm:chapter', self.ns)
-        self.logger.info(f"Found {len(chapter_elements)} chapters")
-
-        for chapter in chapter_elements:
-            try:
-                chapter_data = {
-                    "num": self.get_text(chapter, './/uslm:num'),
-                    "heading": self.get_text(chapter, './/uslm:heading'),
-                    "identifier": chapter.get('identifier', ''),
-                    "sections": []
-                }
-
-                # Extract sections within this chapter
-                section_elements = chapter.findall('.//uslm:section', self.ns)
-                for section in section_elements:
-                    try:
-                        section_data = {
-                            "num": self.get_text(section, './/uslm:num'),
-                            "heading": self.get_text(section, './/uslm:heading'),
-                            "content": self.get_text(section, './/uslm:content'),
-                            "identifier": section.get('identifier', ''),
-                            "subsections": self.extract_subsections(section)
-                        }
-                        chapter_data["sections"].append(section_data)
-                    except Exception as e:
-                        self.logger.error(f"Error extracting section data: {e}")
-
-                chapters.append(chapter_data)
-            except Exception as e:
-                self.logger.error(f"Error extracting chapter data: {e}")
+        if chapters is None:
+            chapters = []
+            for chapter in main.iter(USLM_CHAPTER_TAG):
+                try:
+                    chapters.append(self.extract_chapter(chapter))
+                except Exception as e:
+                    self.logger.error(f"Error extracting chapter data: {e}")
+        self.logger.info(f"Found {len(chapters)} chapters")
 
         # Also extract any sections directly under main (not in chapters)
         sections = []
-        direct_sections = main.findall('./uslm:section', self.ns)
+        direct_sections = main.findall(USLM_SECTION_TAG)
         self.logger.info(f"Found {len(direct_sections)} direct sections")
 
         for section in direct_sections:
             try:
-                section_data = {
-                    "num": self.get_text(section, './/uslm:num'),
-                    "heading": self.get_text(section, './/uslm:heading'),
-                    "content": self.get_text(section, './/uslm:content'),
-                    "identifier": section.get('identifier', ''),
-                    "subsections": self.extract_subsections(section)
-                }
-                sections.append(section_data)
+                sections.append(self.extract_section(section))
             except Exception as e:
                 self.logger.error(f"Error extracting section data: {e}")
 
@@ -365,10 +517,38 @@ class USCProcessor:
 
         return content
 
+    def extract_chapter(self, chapter):
+        """Extract a chapter and all of its sections"""
+        chapter_data = {
+            "num": self.get_text(chapter, './/uslm:num'),
+            "heading": self.get_text(chapter, './/uslm:heading'),
+            "identifier": chapter.get('identifier', ''),
+            "sections": []
+        }
+
+        # Extract sections within this chapter
+        for section in chapter.iter(USLM_SECTION_TAG):
+            try:
+                chapter_data["sections"].append(self.extract_section(section))
+            except Exception as e:
+                self.logger.error(f"Error extracting section data: {e}")
+
+        return chapter_data
+
+    def extract_section(self, section):
+        """Extract a section and its subsection hierarchy"""
+        return {
+            "num": self.get_text(section, './/uslm:num'),
+            "heading": self.get_text(section, './/uslm:heading'),
+            "content": self.get_text(section, './/uslm:content'),
+            "identifier": section.get('identifier', ''),
+            "subsections": self.extract_subsections(section)
+        }
+
     def extract_subsections(self, section):
         """Extract subsection hierarchy"""
         subsections = []
-        for subsec in section.findall('.//uslm:subsection', self.ns):
+        for subsec in section.iter(USLM_SUBSECTION_TAG):
             try:
                 subsection_data = {
                     "num": self.get_text(subsec, './/uslm:num'),
@@ -376,8 +556,9 @@ class USCProcessor:
                 }
 
                 # Add subsection identifier if available
-                if subsec.get('identifier'):
-                    subsection_data["identifier"] = subsec.get('identifier')
+                identifier = subsec.get('identifier')
+                if identifier:
+                    subsection_data["identifier"] = identifier
 
                 # Extract paragraphs within subsections if they exist
                 paragraphs = self.extract_paragraphs(subsec)
@@ -393,7 +574,7 @@ class USCProcessor:
     def extract_paragraphs(self, parent):
         """Extract paragraph hierarchy"""
         paragraphs = []
-        for para in parent.findall('.//uslm:paragraph', self.ns):
+        for para in parent.iter(USLM_PARAGRAPH_TAG):
             try:
                 paragraph_data = {
                     "num": self.get_text(para, './/uslm:num'),
@@ -401,8 +582,9 @@ class USCProcessor:
                 }
 
                 # Add paragraph identifier if available
-                if para.get('identifier'):
-                    paragraph_data["identifier"] = para.get('identifier')
+                identifier = para.get('identifier')
+                if identifier:
+                    paragraph_data["identifier"] = identifier
 
                 # Extract subparagraphs if they exist
                 subparagraphs = self.extract_subparagraphs(para)
@@ -418,7 +600,7 @@ class USCProcessor:
     def extract_subparagraphs(self, parent):
         """Extract subparagraph hierarchy"""
         subparagraphs = []
-        for subpara in parent.findall('.//uslm:subparagraph', self.ns):
+        for subpara in parent.iter(USLM_SUBPARAGRAPH_TAG):
             try:
                 subparagraph_data = {
                     "num": self.get_text(subpara, './/uslm:num'),
@@ -426,8 +608,9 @@ class USCProcessor:
                 }
 
                 # Add subparagraph identifier if available
-                if subpara.get('identifier'):
-                    subparagraph_data["identifier"] = subpara.get('identifier')
+                identifier = subpara.get('identifier')
+                if identifier:
+                    subparagraph_data["identifier"] = identifier
 
                 subparagraphs.append(subparagraph_data)
             except Exception as e:
@@ -435,64 +618,89 @@ class USCProcessor:
 
         return subparagraphs
 
+    def find_first(self, element, xpath):
+        """Find the first element matching a path below the given element
+
+        lxml elements are searched with a compiled ``descendant::name[1]`` XPath
+        cached per path string; anything else falls back to ElementPath ``find``
+        with the path's prefixes expanded to Clark notation.
+
+        Args:
+            element (Element): The XML element to search within
+            xpath (str): The path expression to find the target element
+
+        Returns:
+            Element: The first matching element, or None if not found
+        """
+        if LXML_AVAILABLE and isinstance(element, ET._Element):
+            compiled = self._xpath_cache.get(xpath)
+            if compiled is None:
+                if SIMPLE_DESCENDANT_PATH_RE.match(xpath):
+                    compiled = ET.XPath(f"descendant::{xpath[3:]}[1]", namespaces=self.ns)
+                else:
+                    compiled = False
+                self._xpath_cache[xpath] = compiled
+            if compiled:
+                matches = compiled(element)
+                return matches[0] if matches else None
+        # ElementPath resolves prefixes against the namespace dict on every
+        # call, so expand them to Clark notation once per path instead
+        path = self._clark_paths.get(xpath)
+        if path is None:
+            path = PATH_PREFIX_RE.sub(self._expand_prefix, xpath)
+            self._clark_paths[xpath] = path
+        return element.find(path)
+
+    def _expand_prefix(self, match):
+        """Replace a 'prefix:' match with its namespace in Clark notation"""
+        uri = self.ns.get(match.group(1))
+        return f"{{{uri}}}" if uri else match.group(0)
+
     def get_text(self, element, xpath):
         """Helper to safely extract text from XML elements
 
+        The parser has already decoded the document, so the text here is
+        always str; undecodable input fails in process_xml_file instead.
+
         Args:
             element (Element): The XML element to search within
             xpath (str): The XPath expression to find the target element
 
         Returns:
-            str: The extracted text, or an empty string if not found or on error
-
-        Raises:
-            EncodingError: If there's an encoding error that can't be handled
+            str: The extracted text, or an empty string if not found
         """
-        found = element.find(xpath, self.ns)
-        if found is not None:
-            try:
-                # If the element has children, get all text including from child elements
-                if len(found) > 0:
-                    # Join all text and handle potential encoding issues
-                    text = ''.join(found.itertext())
-                    return text.strip() if text else ""
-                # Otherwise just get the text
-                elif found.text:
-                    return found.text.strip()
-                return ""
-            except UnicodeDecodeError as e:
-                self.logger.warning(f"Unicode decode error extracting text: {e}")
-                # Try to sanitize the text if there's an encoding issue
-                try:
-                    if len(found) > 0:
-                        # Get all text and encode/decode to handle problematic characters
-                        text_parts = []
-                        for part in found.itertext():
-                            try:
-                                # Handle potential encoding issues by re-encoding with error handling
-                                if isinstance(part, str):
-                                    sanitized = part.encode('utf-8', 'ignore').decode('utf-8')
-                                    text_parts.append(sanitized)
-                            except Exception as part_error:
-                                self.logger.debug(f"Skipping problematic text part: {part_error}")
-                        return ''.join(text_parts).strip()
-                    elif found.text:
-                        # Encode and decode to handle problematic characters
-                        if isinstance(found.text, str):
-                            return found.text.encode('utf-8', 'ignore').decode('utf-8').strip()
-                        return ""
-                except Exception as e2:
-                    self.logger.error(f"Failed to sanitize text: {e2}")
-                    # If we can't handle the encoding issue, raise an EncodingError
-                    # but with a fallback empty string for non-critical text
-                    if xpath.endswith('content'):
-                        raise EncodingError(f"Critical encoding error in content: {e2}") from e2
-                    return ""
-            except Exception as e:
-                self.logger.warning(f"Error extracting text: {e}")
-                # For non-encoding errors, just return empty string
-                return ""
-        return ""
+        found = self.find_first(element, xpath)
+        if found is None:
+            return ""
+        # Leaf elements (the common case) hold their text directly
+        if len(found) == 0:
+            text = found.text
+        else:
+            # Include the text of nested inline elements
+            text = ''.join(found.itertext())
+        return text.strip() if text else ""
+
+def process_zip_worker(zip_path, download_dir, output_dir):
+    """Process one zip file in a worker process
+
+    Module-level so it can be pickled by ProcessPoolExecutor.
+
+    Returns:
+        bool: True if the zip file was processed successfully
+    """
+    processor = USCProcessor(download_dir=download_dir, output_dir=output_dir)
+    processor.logger.info(f"Processing {zip_path}")
+    # Already one process per archive, so don't fan out again per member
+    return processor.process_zip_file(Path(zip_path), max_workers=1)
+
+def process_xml_member_worker(zip_path, member_name, download_dir, output_dir):
+    """Process one XML member of a zip file in a worker process
+
+    Module-level so it can be pickled by ProcessPoolExecutor.
+    """
+    processor = USCProcessor(download_dir=download_dir, output_dir=output_dir)
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        processor._process_zip_member(zip_ref, zip_ref.getinfo(member_name))
 
 if __name__ == "__main__":
     import argparse
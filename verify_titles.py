@@ -2,6 +2,15 @@ from pathlib import Path
 import json
 import re
 
+# orjson parses the large per-title files several times faster
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+USC_JSON_RE = re.compile(r'usc(\d+)\.json')
+
 def verify_titles():
     """Verify that all titles have been processed"""
     processed_dir = Path("processed")
@@ -12,7 +21,7 @@ def verify_titles():
     # Extract title numbers from filenames
     title_numbers = []
     for json_file in json_files:
-        match = re.search(r'usc(\d+)\.json', json_file.name)
+        match = USC_JSON_RE.search(json_file.name)
         if match:
             title_numbers.append(int(match.group(1)))
     
@@ -33,8 +42,11 @@ def verify_titles():
     invalid_files = []
     for json_file in json_files:
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if ORJSON_AVAILABLE:
+                data = orjson.loads(json_file.read_bytes())
+            else:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
             
             # Check if the file has the expected structure
             if not isinstance(data, dict) or 'metadata' not in data or 'content' not in data:
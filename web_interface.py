@@ -1,16 +1,44 @@
-from flask import Flask, render_template, request, redirect, url_for, Response, jsonify, flash, session
+from flask import Flask, render_template, request, redirect, url_for, Response, jsonify, flash, session, make_response
 import json
 from pathlib import Path
 import re
 import logging
 import traceback
 import functools
+import fnmatch
+import heapq
+import os
+import threading
 import time
 import gzip
-from io import BytesIO
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.http import http_date
 from datetime import datetime, timedelta
 
+# orjson parses the large per-title JSON files several times faster
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# pyahocorasick finds every query string in a single pass over a section
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# ijson can read a title's heading without parsing the rest of the file
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 # Import our custom modules
 try:
     from update_tracker import USCodeUpdateTracker
@@ -76,6 +104,27 @@ class EncodingError(WebInterfaceError):
 # Create Flask app
 app = Flask(__name__)
 
+if ORJSON_AVAILABLE:
+    class OrjsonProvider(DefaultJSONProvider):
+        """Flask JSON provider that serializes with orjson
+
+        Keys are sorted as by the default provider. Dates, and types orjson
+        can't serialize itself, go through the default provider's fallback,
+        so they come out the same. Unlike the default, non-ASCII text is
+        written as UTF-8 rather than \\u escapes.
+        """
+
+        def dumps(self, obj, **kwargs):
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            if kwargs.get('sort_keys', self.sort_keys):
+                option |= orjson.OPT_SORT_KEYS
+            if kwargs.get('indent'):
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    # jsonify() in every API endpoint goes through the app's provider
+    app.json = OrjsonProvider(app)
+
 # Configure secret key for session management
 app.secret_key = 'uscode_browser_secret_key'  # In production, use a proper secret key
 
@@ -85,13 +134,37 @@ webhook_manager = WebhookManager(data_dir="webhook_data")
 diff_visualizer = DiffVisualizer(data_dir="diff_data")
 
 # Cache settings
-CACHE_TIMEOUT = 3600  # Cache timeout in seconds (1 hour)
+CACHE_TIMEOUT = 3600  # Browser cache max-age in seconds (1 hour)
 CACHE_ENABLED = True  # Enable/disable caching
 
-# In-memory cache for title data
-title_cache = {}
-# In-memory cache for all titles list
-all_titles_cache = {'data': None, 'timestamp': 0}
+# Parsed titles (and their search indexes) are cached keyed on the file's
+# mtime; the least recently used are evicted beyond this many, since a few
+# large titles alone can take hundreds of MB
+TITLE_CACHE_SIZE = 16
+# The word vocabulary of each title is much smaller than its data and is
+# kept for every title, so search can skip titles that can't match
+TITLE_VOCABULARY_CACHE_SIZE = 64
+# Tables of contents (chapter and section headings without the section
+# text) are small enough to keep for every title
+TOC_CACHE_SIZE = 64
+# Locks shared out by key hash among concurrent loads of the title caches
+CACHE_LOCK_STRIPES = 64
+# Rendered version diffs kept, per title, version pair and view mode
+DIFF_CACHE_SIZE = 32
+# Rendered title, chapter and section pages kept, per URL and title version
+PAGE_CACHE_SIZE = 256
+rendered_pages = OrderedDict()
+rendered_pages_lock = threading.Lock()
+
+# Threads shared by the title listing and search to read and parse title
+# files side by side; file reads release the GIL, so a cold start overlaps
+TITLE_LOAD_WORKERS = min(8, os.cpu_count() or 1)
+TITLE_POOL = ThreadPoolExecutor(max_workers=TITLE_LOAD_WORKERS)
+
+# In-memory cache for all titles list, valid while the name and mtime of
+# every title file are unchanged
+all_titles_cache = {'data': None, 'key': None}
+all_titles_lock = threading.Lock()
 
 # Configure logging
 logging.basicConfig(
@@ -105,8 +178,28 @@ logging.basicConfig(
 
 logger = logging.getLogger('web_interface')
 
+# Words as the search index splits section text into them
+SEARCH_WORD_RE = re.compile(r'\w+')
+# Title number in a processed file name such as usc01.json
+USC_JSON_RE = re.compile(r'usc(\d+)\.json')
+# Quoted exact phrases in a search query
+QUOTED_PHRASE_RE = re.compile(r'"([^"]+)"')
+# Chapter and section numbers in their "num" fields, e.g. "CHAPTER 3—", "§ 12."
+CHAPTER_NUM_RE = re.compile(r'CHAPTER (\d+)')
+SECTION_NUM_RE = re.compile(r'\u00a7\s*(\d+)')
+# A title number in a search suggestion query, e.g. "title 5" or "t5"
+TITLE_IN_QUERY_RE = re.compile(r'(?:title|t)[\s]*?(\d+)')
+
 # Compression threshold in bytes
 COMPRESSION_THRESHOLD = 1024  # Only compress responses larger than 1KB
+# gzip levels: dynamic API JSON favours speed, while rendered pages repeat
+# across users and their compressed bytes are cached, so they get more effort
+JSON_COMPRESSION_LEVEL = 1
+PAGE_COMPRESSION_LEVEL = 6
+COMPRESSED_CACHE_SIZE = 32  # Number of compressed response bodies kept
+
+# Longest search suggestion query matched; longer input is cut to this
+SUGGESTION_QUERY_MAX_LENGTH = 64
 
 # Cache control decorator
 def cache_control(max_age=CACHE_TIMEOUT):
@@ -134,6 +227,72 @@ def cache_control(max_age=CACHE_TIMEOUT):
         return wrapped_view
     return decorator
 
+def title_etag(view_func):
+    """Decorator to make a title's pages conditional on its file version
+
+    The response gets a weak ETag from the title file's mtime. A request whose
+    If-None-Match already holds that tag is answered 304 Not Modified without
+    loading the title or rendering the page.
+    """
+    @functools.wraps(view_func)
+    def wrapped_view(title_num, *args, **kwargs):
+        json_path = Path("processed") / f"usc{str(title_num).zfill(2)}.json"
+        try:
+            etag = f"t{title_num}-{json_path.stat().st_mtime_ns}"
+        except OSError:
+            # Let the view report the missing title
+            return view_func(title_num, *args, **kwargs)
+
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = make_response(view_func(title_num, *args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag, weak=True)
+        return response
+    return wrapped_view
+
+def cached_title_page(view_func):
+    """Decorator to reuse a title page's rendered HTML while its file is unchanged
+
+    Pages are kept per URL and title file mtime, and the least recently used
+    are dropped beyond PAGE_CACHE_SIZE. Only successful renders are kept:
+    the views return errors as (page, status) tuples.
+    """
+    @functools.wraps(view_func)
+    def wrapped_view(title_num, *args, **kwargs):
+        json_path = Path("processed") / f"usc{str(title_num).zfill(2)}.json"
+        try:
+            key = (request.path, json_path.stat().st_mtime_ns)
+        except OSError:
+            # Let the view report the missing title
+            return view_func(title_num, *args, **kwargs)
+
+        if CACHE_ENABLED:
+            with rendered_pages_lock:
+                page = rendered_pages.get(key)
+                if page is not None:
+                    rendered_pages.move_to_end(key)
+                    return page
+
+        page = view_func(title_num, *args, **kwargs)
+        if CACHE_ENABLED and isinstance(page, str):
+            with rendered_pages_lock:
+                rendered_pages[key] = page
+                if len(rendered_pages) > PAGE_CACHE_SIZE:
+                    rendered_pages.popitem(last=False)
+        return page
+    return wrapped_view
+
+@functools.lru_cache(maxsize=COMPRESSED_CACHE_SIZE)
+def gzip_body(data, level):
+    """Gzip a response body, reusing the result for identical bodies
+
+    mtime=0 keeps the output identical for identical input.
+    """
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
 # Compression middleware
 @app.after_request
 def add_compression(response):
@@ -147,6 +306,17 @@ def add_compression(response):
     if not content_type.startswith(('text/', 'application/json', 'application/javascript', 'application/xml')):
         return response
 
+    # Check if client accepts gzip encoding (a q=0 entry refuses it)
+    if request.accept_encodings.quality('gzip') <= 0:
+        return response
+
+    # Decide from the headers where possible, so bodies that won't be
+    # compressed are never read into memory
+    if response.is_streamed:
+        return response
+    if response.content_length is not None and response.content_length < COMPRESSION_THRESHOLD:
+        return response
+
     # Make sure we have response data
     try:
         response_data = response.get_data()
@@ -156,19 +326,15 @@ def add_compression(response):
         logger.warning(f"Error getting response data for compression: {e}")
         return response
 
-    # Check if client accepts gzip encoding
-    accept_encoding = request.headers.get('Accept-Encoding', '')
-    if 'gzip' not in accept_encoding.lower():
-        return response
-
     # Compress the response
     try:
-        gzip_buffer = BytesIO()
-        with gzip.GzipFile(mode='wb', fileobj=gzip_buffer) as gzip_file:
-            gzip_file.write(response_data)
+        if content_type.startswith('application/json'):
+            level = JSON_COMPRESSION_LEVEL
+        else:
+            level = PAGE_COMPRESSION_LEVEL
 
         # Update response with compressed data
-        response.set_data(gzip_buffer.getvalue())
+        response.set_data(gzip_body(response_data, level))
         response.headers['Content-Encoding'] = 'gzip'
         response.headers['Content-Length'] = len(response.get_data())
         response.headers['Vary'] = 'Accept-Encoding'
@@ -195,97 +361,523 @@ templates_dir.mkdir(exist_ok=True)
 static_dir = Path("static")
 static_dir.mkdir(exist_ok=True)
 
-def load_title_data(title_num, use_cache=True):
+def load_json_file(path, encoding='utf-8'):
+    """Load a JSON file, using orjson when available
+
+    The bytes are decoded explicitly so a wrong encoding still raises
+    UnicodeDecodeError and callers can retry with another one.
+
+    Args:
+        path (Path): The JSON file to load
+        encoding (str): The text encoding of the file
+
+    Returns:
+        The parsed JSON data
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes().decode(encoding))
+    with open(path, 'r', encoding=encoding) as f:
+        return json.load(f)
+
+def coalesced_lru_cache(maxsize):
+    """functools.lru_cache that loads each key only once under concurrency
+
+    With a plain lru_cache, threads that miss on the same key at the same
+    time each run the load. Here calls are serialized per key (over a fixed
+    set of lock stripes), so the first thread loads while the others wait
+    and then read its result from the cache.
+
+    Args:
+        maxsize (int): Maximum number of cached results
+    """
+    def decorator(func):
+        cached = functools.lru_cache(maxsize=maxsize)(func)
+        stripes = [threading.Lock() for _ in range(CACHE_LOCK_STRIPES)]
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            with stripes[hash(args) % CACHE_LOCK_STRIPES]:
+                return cached(*args)
+
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+    return decorator
+
+@coalesced_lru_cache(maxsize=TITLE_CACHE_SIZE)
+def _parse_title_file(json_path, mtime_ns):
+    """Parse a processed title file, retrying as latin-1 if it isn't UTF-8
+
+    Cached per (path, mtime), so a title rewritten by the update pipeline
+    is parsed again on its next request and unchanged titles never expire.
+    """
+    try:
+        data = load_json_file(json_path)
+        logger.info(f"Successfully loaded {json_path.name} with UTF-8 encoding")
+    except UnicodeDecodeError as e:
+        logger.warning(f"UTF-8 decode error for {json_path.name}: {e}")
+        data = load_json_file(json_path, 'latin-1')
+        logger.warning(f"Successfully loaded {json_path.name} with latin-1 encoding")
+    return data
+
+def read_title_file(json_path, use_cache=True):
+    """Load a processed title file, through the parsed-title cache if enabled
+
+    Args:
+        json_path (Path): The usc{NN}.json file to load
+        use_cache (bool): Whether to use the cache (default: True)
+
+    Returns:
+        dict: The parsed title data
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the file isn't valid JSON in either encoding
+    """
+    mtime_ns = json_path.stat().st_mtime_ns
+    if CACHE_ENABLED and use_cache:
+        return _parse_title_file(json_path, mtime_ns)
+    return _parse_title_file.__wrapped__(json_path, mtime_ns)
+
+# Keys of a section that hold its text rather than describe it
+SECTION_BODY_KEYS = ('content', 'subsections')
+
+def _strip_section_bodies(sections):
+    return [{key: value for key, value in section.items() if key not in SECTION_BODY_KEYS}
+            for section in sections]
+
+@coalesced_lru_cache(maxsize=TOC_CACHE_SIZE)
+def _title_toc(json_path, mtime_ns):
+    """Copy of a title file with the section text left out
+
+    Parses the file without the parsed-title cache, so pages that only list
+    chapters and sections don't keep whole titles in memory.
+    """
+    data = _parse_title_file.__wrapped__(json_path, mtime_ns)
+    toc = dict(data)
+    if isinstance(data.get('content'), dict):
+        content = toc['content'] = dict(data['content'])
+        if 'sections' in content:
+            content['sections'] = _strip_section_bodies(content['sections'])
+        if 'chapters' in content:
+            content['chapters'] = [
+                dict(chapter, sections=_strip_section_bodies(chapter['sections'])) if 'sections' in chapter else chapter
+                for chapter in content['chapters']
+            ]
+    return toc
+
+def read_title_toc(json_path, use_cache=True):
+    """Load a title's table of contents: its metadata, chapters and section
+    numbers and headings, without the section text
+
+    Args:
+        json_path (Path): The usc{NN}.json file to load
+        use_cache (bool): Whether to use the cache (default: True)
+
+    Returns:
+        dict: The title data, minus each section's content and subsections
+    """
+    mtime_ns = json_path.stat().st_mtime_ns
+    if CACHE_ENABLED and use_cache:
+        return _title_toc(json_path, mtime_ns)
+    return _title_toc.__wrapped__(json_path, mtime_ns)
+
+@coalesced_lru_cache(maxsize=256)
+def _read_title_heading(json_path, mtime_ns):
+    """Read content.title.heading from a title file, or None if it has none
+
+    With ijson the file is only streamed up to the heading, which the
+    processor writes before the chapters, instead of being parsed whole.
+    """
+    if IJSON_AVAILABLE:
+        try:
+            with open(json_path, 'rb') as f:
+                return next(ijson.items(f, 'content.title.heading'), None)
+        except Exception as e:
+            # e.g. a latin-1 file, which the full loader knows how to read
+            logger.debug(f"Could not stream the heading of {json_path.name}: {e}")
+
+    # Parse without caching: listing the titles must not fill the title
+    # cache with every title's full data just for their headings
+    data = _parse_title_file.__wrapped__(json_path, mtime_ns)
+    try:
+        return data['content']['title']['heading']
+    except (KeyError, TypeError):
+        return None
+
+def read_title_heading(json_path, use_cache=True):
+    """Read the heading of a processed title file, cached per file version
+
+    Args:
+        json_path (Path): The usc{NN}.json file to read
+        use_cache (bool): Whether to use the cache (default: True)
+
+    Returns:
+        str: The title heading, or None if the file has none
+    """
+    mtime_ns = json_path.stat().st_mtime_ns
+    if CACHE_ENABLED and use_cache:
+        return _read_title_heading(json_path, mtime_ns)
+    return _read_title_heading.__wrapped__(json_path, mtime_ns)
+
+class SectionRows:
+    """The chapter sections of one title flattened into parallel lists
+
+    Row i of every list describes the same section, in document order, so a
+    search streams through a few flat lists instead of walking the nested
+    chapter and section dicts on every query.
+    """
+
+    def __init__(self, data):
+        self.chapter_nums = []
+        self.chapter_headings = []
+        self.section_nums = []
+        self.headings = []
+        self.contents = []
+        # Lowercased "heading content" text and heading of each section, so
+        # searches don't rebuild and lowercase them on every query
+        self.texts = []
+        self.headings_lower = []
+        for chapter_idx, chapter in enumerate(data.get('content', {}).get('chapters', [])):
+            chapter_heading = chapter.get('heading', f"Chapter {chapter_idx + 1}")
+            for section_idx, section in enumerate(chapter.get('sections', [])):
+                heading = section.get('heading', '')
+                content = section.get('content', '')
+                self.chapter_nums.append(chapter_idx + 1)
+                self.chapter_headings.append(chapter_heading)
+                self.section_nums.append(section_idx + 1)
+                self.headings.append(heading)
+                self.contents.append(content)
+                self.texts.append(f"{heading} {content}".lower())
+                self.headings_lower.append(heading.lower())
+
+    def __len__(self):
+        return len(self.texts)
+
+    def candidates(self, needles):
+        """Rows that may contain one of the search strings; None means all"""
+        return None
+
+class SectionIndex(SectionRows):
+    """Inverted word index over the chapter sections of one title
+
+    Narrows a search down to the sections that can contain a query string
+    before their text is scanned. Search matches substrings, so "tax" must
+    still find "taxation": a string can only occur in a section if each word
+    inside it is part of some word of that section, so query words are looked
+    up by substring in the index's vocabulary rather than by exact key.
+    """
+
+    def __init__(self, data):
+        super().__init__(data)
+        postings = defaultdict(set)
+        for row, section_text in enumerate(self.texts):
+            for word in set(SEARCH_WORD_RE.findall(section_text)):
+                postings[word].add(row)
+
+        # The vocabulary is kept as one newline-separated string so substring
+        # lookups run in str.find instead of a Python loop over every word
+        self.words = list(postings)
+        self.postings = [postings[word] for word in self.words]
+        self.offsets = []
+        offset = 0
+        for word in self.words:
+            self.offsets.append(offset)
+            offset += len(word) + 1
+        self.vocabulary = '\n'.join(self.words)
+
+    def sections_containing(self, word):
+        """Rows with a word that contains the given (lowercase) word"""
+        sections = set()
+        pos = self.vocabulary.find(word)
+        while pos != -1:
+            i = bisect_right(self.offsets, pos) - 1
+            sections |= self.postings[i]
+            # Continue from the next vocabulary word
+            pos = self.vocabulary.find(word, self.offsets[i] + len(self.words[i]) + 1)
+        return sections
+
+    def candidates(self, needles):
+        """Sections that may contain at least one of the lowercase search strings
+
+        Returns:
+            set: Row numbers, or None if a string has no word characters and
+            every section has to be scanned
+        """
+        candidates = set()
+        for needle in needles:
+            words = SEARCH_WORD_RE.findall(needle)
+            if not words:
+                return None
+            sections = self.sections_containing(words[0])
+            for word in words[1:]:
+                if not sections:
+                    break
+                sections &= self.sections_containing(word)
+            candidates |= sections
+        return candidates
+
+@coalesced_lru_cache(maxsize=TITLE_CACHE_SIZE)
+def _index_title_file(json_path, mtime_ns):
+    """Build the section index for a title file, cached like its parsed data"""
+    return SectionIndex(_parse_title_file(json_path, mtime_ns))
+
+@coalesced_lru_cache(maxsize=TITLE_VOCABULARY_CACHE_SIZE)
+def _title_vocabulary(json_path, mtime_ns):
+    """The word vocabulary of a title file, kept after its data is evicted
+
+    Parses the file without the parsed-title and index caches, so a search
+    over every title doesn't evict the titles being browsed.
+    """
+    words = set()
+    for section_text in SectionRows(_parse_title_file.__wrapped__(json_path, mtime_ns)).texts:
+        words.update(SEARCH_WORD_RE.findall(section_text))
+    return '\n'.join(words)
+
+def title_may_match(json_path, needles):
+    """Check whether any of the search strings can occur in a title's sections
+
+    Uses the same substring test as SectionIndex.candidates on the title's
+    whole vocabulary, so search can skip titles without loading them.
+
+    Args:
+        json_path (Path): The usc{NN}.json file to check
+        needles (iterable): The lowercase search strings
+
+    Returns:
+        bool: False only if no section of the title can contain any of them
+    """
+    vocabulary = _title_vocabulary(json_path, json_path.stat().st_mtime_ns)
+    for needle in needles:
+        # all() of no words is True: a string without word characters can't
+        # be ruled out
+        if all(word in vocabulary for word in SEARCH_WORD_RE.findall(needle)):
+            return True
+    return False
+
+def read_title_for_search(json_path, use_cache=True):
+    """Load a title and its section rows from the same version of the file
+
+    Args:
+        json_path (Path): The usc{NN}.json file to load
+        use_cache (bool): Whether to use the cache (default: True)
+
+    Returns:
+        tuple: (title data, SectionRows) - the rows are a full SectionIndex
+        unless the cache is bypassed, since the index only pays off once it
+        is reused
+    """
+    mtime_ns = json_path.stat().st_mtime_ns
+    if CACHE_ENABLED and use_cache:
+        return _parse_title_file(json_path, mtime_ns), _index_title_file(json_path, mtime_ns)
+    data = _parse_title_file.__wrapped__(json_path, mtime_ns)
+    return data, SectionRows(data)
+
+class TitleNumbering:
+    """Where each chapter and section number sits in a title's lists
+
+    Chapter and section pages are addressed by the number in the "num"
+    field ("CHAPTER 3", "§ 12"). This maps those numbers to list positions
+    once per file version, instead of pattern-matching every chapter and
+    section on each request. The first of any duplicate numbers wins.
+    """
+
+    def __init__(self, data):
+        self.chapters = {}  # chapter number -> chapter index
+        self.sections = {}  # (chapter index, section number) -> section index
+        for chapter_idx, chapter in enumerate(data['content']['chapters']):
+            number = self._number(CHAPTER_NUM_RE, chapter)
+            if number is not None:
+                self.chapters.setdefault(number, chapter_idx)
+            try:
+                sections = chapter.get('sections', [])
+            except AttributeError:
+                continue
+            for section_idx, section in enumerate(sections):
+                number = self._number(SECTION_NUM_RE, section)
+                if number is not None:
+                    self.sections.setdefault((chapter_idx, number), section_idx)
+
+    @staticmethod
+    def _number(pattern, item):
+        try:
+            match = pattern.search(item.get('num', ''))
+            return int(match.group(1)) if match else None
+        except (AttributeError, ValueError, TypeError):
+            return None
+
+@coalesced_lru_cache(maxsize=TOC_CACHE_SIZE)
+def _title_numbering(json_path, mtime_ns):
+    """Build the chapter and section numbering of a title file, cached like its TOC"""
+    return TitleNumbering(_title_toc(json_path, mtime_ns))
+
+def title_numbering(title_num, use_cache=True):
+    """Get the chapter and section numbering of a title
+
+    Args:
+        title_num (int): The title number
+        use_cache (bool): Whether to use the cache (default: True)
+
+    Returns:
+        TitleNumbering: The positions of the title's numbered chapters and sections
+    """
+    json_path = Path("processed") / f"usc{str(title_num).zfill(2)}.json"
+    mtime_ns = json_path.stat().st_mtime_ns
+    if CACHE_ENABLED and use_cache:
+        return _title_numbering(json_path, mtime_ns)
+    return TitleNumbering(_title_toc.__wrapped__(json_path, mtime_ns))
+
+class TitleHeadings:
+    """Chapter and section headings of one title, as search suggestions match them
+
+    Each entry keeps the heading as shown next to its lowercased copy, so
+    suggestions don't lowercase every heading of the title per keystroke.
+    A trigram index over the lowercased headings narrows a query down to the
+    headings that contain all of its trigrams before any substring test.
+    """
+
+    def __init__(self, data):
+        self.chapters = []  # (chapter number, heading, lowercased heading)
+        self.sections = []  # (chapter number, section number, heading, lowercased heading)
+        for chapter_idx, chapter in enumerate(data['content']['chapters']):
+            chapter_num = chapter_idx + 1
+            self.chapters.append((chapter_num, chapter.get('heading'), chapter.get('heading', '').lower()))
+            for section_idx, section in enumerate(chapter.get('sections', [])):
+                self.sections.append((chapter_num, section_idx + 1, section.get('heading'), section.get('heading', '').lower()))
+        self.chapter_trigrams = self._trigram_index(chapter[-1] for chapter in self.chapters)
+        self.section_trigrams = self._trigram_index(section[-1] for section in self.sections)
+
+    @staticmethod
+    def _trigram_index(headings):
+        """Map each trigram to the positions of the headings containing it, in order"""
+        index = defaultdict(list)
+        for position, heading in enumerate(headings):
+            for trigram in {heading[i:i + 3] for i in range(len(heading) - 2)}:
+                index[trigram].append(position)
+        return dict(index)
+
+    @staticmethod
+    def _matches(entries, trigrams, query, limit):
+        """The first entries whose lowercased heading contains the query"""
+        if len(query) < 3:
+            candidates = range(len(entries))
+        else:
+            # Every trigram of the query occurs in a heading that contains it
+            postings = sorted((trigrams.get(query[i:i + 3], ()) for i in range(len(query) - 2)), key=len)
+            positions = set(postings[0])
+            for posting in postings[1:]:
+                if not positions:
+                    break
+                positions.intersection_update(posting)
+            candidates = sorted(positions)
+
+        matches = []
+        for position in candidates:
+            if query in entries[position][-1]:
+                matches.append(entries[position])
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def matching_chapters(self, query, limit):
+        """Up to limit (chapter number, heading, lowercased heading) entries
+        whose heading contains the lowercase query, in document order"""
+        return self._matches(self.chapters, self.chapter_trigrams, query, limit)
+
+    def matching_sections(self, query, limit):
+        """Up to limit (chapter number, section number, heading, lowercased
+        heading) entries whose heading contains the lowercase query, in
+        document order"""
+        return self._matches(self.sections, self.section_trigrams, query, limit)
+
+@coalesced_lru_cache(maxsize=TOC_CACHE_SIZE)
+def _title_headings(json_path, mtime_ns):
+    """Collect the headings of a title file, cached like its TOC"""
+    return TitleHeadings(_title_toc(json_path, mtime_ns))
+
+def title_headings(title_num, use_cache=True):
+    """Get the chapter and section headings of a title
+
+    Args:
+        title_num (int): The title number
+        use_cache (bool): Whether to use the cache (default: True)
+
+    Returns:
+        TitleHeadings: The title's headings in document order
+    """
+    json_path = Path("processed") / f"usc{str(title_num).zfill(2)}.json"
+    mtime_ns = json_path.stat().st_mtime_ns
+    if CACHE_ENABLED and use_cache:
+        return _title_headings(json_path, mtime_ns)
+    return TitleHeadings(_title_toc.__wrapped__(json_path, mtime_ns))
+
+def load_title_data(title_num, use_cache=True, sections=True):
     """Load data for a specific title
 
     Args:
         title_num (int): The title number to load
         use_cache (bool): Whether to use the cache (default: True)
+        sections (bool): Whether to include the section text; without it only
+            the table of contents is loaded (default: True)
 
     Returns:
         dict: The title data, or None if not found or on error
 
     Raises:
         DataLoadError: If there's an error loading the data
-        EncodingError: If there's an encoding error that can't be handled
     """
-    # Check cache first if enabled
-    if CACHE_ENABLED and use_cache and title_num in title_cache:
-        cache_entry = title_cache[title_num]
-        # Check if cache entry is still valid
-        if time.time() - cache_entry['timestamp'] < CACHE_TIMEOUT:
-            logger.debug(f"Using cached data for title {title_num}")
-            return cache_entry['data']
-        else:
-            logger.debug(f"Cache expired for title {title_num}")
+    title_str = str(title_num).zfill(2)
+    processed_dir = Path("processed")
+
+    if not processed_dir.exists():
+        logger.error(f"Processed directory not found: {processed_dir}")
+        raise DataLoadError(f"Processed directory not found: {processed_dir}")
 
+    # Load the JSON data; read_title_file handles the encoding fallback
     try:
-        title_str = str(title_num).zfill(2)
-        processed_dir = Path("processed")
+        read = read_title_file if sections else read_title_toc
+        return read(processed_dir / f"usc{title_str}.json", use_cache)
+    except FileNotFoundError:
+        logger.warning(f"Title {title_num} not found in processed directory")
+        return None
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON decode error for title {title_num}: {e}")
+        raise DataLoadError(f"Invalid JSON format in title {title_num}") from e
+    except Exception as e:
+        logger.error(f"Unexpected error loading title {title_num}: {e}")
+        logger.debug(f"Traceback: {traceback.format_exc()}")
+        raise DataLoadError(f"Failed to load title {title_num}") from e
 
-        if not processed_dir.exists():
-            logger.error(f"Processed directory not found: {processed_dir}")
-            raise DataLoadError(f"Processed directory not found: {processed_dir}")
+def title_listing_entry(json_file):
+    """Build the title list entry for one processed file
 
-        # Find the JSON file for this title
-        json_files = list(processed_dir.glob(f"usc{title_str}.json"))
-        if not json_files:
-            logger.warning(f"Title {title_num} not found in processed directory")
-            return None
+    Args:
+        json_file (Path): Path to a processed title JSON file
 
-        # Load the JSON data
-        try:
-            with open(json_files[0], 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            logger.info(f"Successfully loaded title {title_num} with UTF-8 encoding")
+    Returns:
+        dict: The title number and name, or None if the file is not a title
+    """
+    match = USC_JSON_RE.search(json_file.name)
+    if not match:
+        return None
 
-            # Cache the data if caching is enabled
-            if CACHE_ENABLED:
-                title_cache[title_num] = {
-                    'data': data,
-                    'timestamp': time.time()
-                }
-                logger.debug(f"Cached data for title {title_num}")
+    title_num = int(match.group(1))
 
-            return data
-        except UnicodeDecodeError as e:
-            # Try with different encodings if UTF-8 fails
-            logger.warning(f"UTF-8 decode error for title {title_num}: {e}")
-            try:
-                with open(json_files[0], 'r', encoding='latin-1') as f:
-                    data = json.load(f)
-                logger.warning(f"Successfully loaded title {title_num} with latin-1 encoding")
-
-                # Cache the data if caching is enabled
-                if CACHE_ENABLED:
-                    title_cache[title_num] = {
-                        'data': data,
-                        'timestamp': time.time()
-                    }
-                    logger.debug(f"Cached data for title {title_num} (latin-1 encoding)")
-
-                return data
-            except json.JSONDecodeError as e2:
-                logger.error(f"JSON decode error for title {title_num} with latin-1 encoding: {e2}")
-                raise DataLoadError(f"Invalid JSON format in title {title_num}") from e2
-            except Exception as e2:
-                logger.error(f"Error loading title {title_num} with alternative encoding: {e2}")
-                raise EncodingError(f"Failed to decode title {title_num} with any encoding") from e2
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error for title {title_num}: {e}")
-            raise DataLoadError(f"Invalid JSON format in title {title_num}") from e
-        except Exception as e:
-            logger.error(f"Unexpected error loading title {title_num}: {e}")
-            logger.debug(f"Traceback: {traceback.format_exc()}")
-            raise DataLoadError(f"Failed to load title {title_num}") from e
-    except (DataLoadError, EncodingError):
-        # Re-raise these specific exceptions to be caught by the caller
-        raise
+    # Read just the heading to get the name
+    try:
+        title_name = read_title_heading(json_file)
     except Exception as e:
-        # Catch any other exceptions and convert to DataLoadError
-        logger.error(f"Unexpected error in load_title_data for title {title_num}: {e}")
-        logger.debug(f"Traceback: {traceback.format_exc()}")
-        raise DataLoadError(f"Unexpected error loading title {title_num}") from e
+        logger.error(f"Error loading {json_file.name}: {e}")
+        title_name = None
+
+    # Use a fallback for the title name
+    if title_name is None:
+        title_name = f"Title {title_num}"
+
+    return {
+        'number': title_num,
+        'name': title_name
+    }
 
 def get_all_titles(use_cache=True):
     """Get a list of all available titles
@@ -299,15 +891,6 @@ def get_all_titles(use_cache=True):
     Raises:
         DataLoadError: If there's an error loading the data directory
     """
-    # Check cache first if enabled
-    if CACHE_ENABLED and use_cache and all_titles_cache['data'] is not None:
-        # Check if cache entry is still valid
-        if time.time() - all_titles_cache['timestamp'] < CACHE_TIMEOUT:
-            logger.debug("Using cached data for all titles")
-            return all_titles_cache['data']
-        else:
-            logger.debug("Cache expired for all titles")
-
     try:
         processed_dir = Path("processed")
 
@@ -322,87 +905,31 @@ def get_all_titles(use_cache=True):
             logger.warning("No JSON files found in processed directory")
             return []
 
-        # Extract title numbers and names
-        titles = []
-        for json_file in json_files:
-            match = re.search(r'usc(\d+)\.json', json_file.name)
-            if match:
-                title_num = int(match.group(1))
-
-                # Try to get title from cache first
-                if CACHE_ENABLED and title_num in title_cache:
-                    cache_entry = title_cache[title_num]
-                    if time.time() - cache_entry['timestamp'] < CACHE_TIMEOUT:
-                        data = cache_entry['data']
-                        logger.debug(f"Using cached data for title {title_num} in get_all_titles")
-                    else:
-                        # Load the title data to get the name
-                        data = load_title_data(title_num, use_cache=False)
-                else:
-                    # Load the title data to get the name
-                    try:
-                        try:
-                            with open(json_file, 'r', encoding='utf-8') as f:
-                                data = json.load(f)
-
-                            # Cache individual title data
-                            if CACHE_ENABLED:
-                                title_cache[title_num] = {
-                                    'data': data,
-                                    'timestamp': time.time()
-                                }
-                        except UnicodeDecodeError as e:
-                            # Try with different encodings if UTF-8 fails
-                            logger.warning(f"UTF-8 decode error for {json_file.name}: {e}")
-                            try:
-                                with open(json_file, 'r', encoding='latin-1') as f:
-                                    data = json.load(f)
-                                logger.warning(f"Successfully loaded {json_file.name} with latin-1 encoding")
-
-                                # Cache individual title data
-                                if CACHE_ENABLED:
-                                    title_cache[title_num] = {
-                                        'data': data,
-                                        'timestamp': time.time()
-                                    }
-                            except Exception as e2:
-                                logger.error(f"Error loading {json_file.name} with alternative encoding: {e2}")
-                                # Use a fallback for the title name
-                                data = {"content": {"title": {"heading": f"Title {title_num}"}}}
-                        except json.JSONDecodeError as e:
-                            logger.error(f"JSON decode error for {json_file.name}: {e}")
-                            # Use a fallback for the title name
-                            data = {"content": {"title": {"heading": f"Title {title_num}"}}}
-                        except Exception as e:
-                            logger.error(f"Unexpected error loading {json_file.name}: {e}")
-                            # Use a fallback for the title name
-                            data = {"content": {"title": {"heading": f"Title {title_num}"}}}
-                    except Exception as e:
-                        logger.error(f"Error processing title data for {json_file}: {e}")
-                        # Use a fallback for the title name
-                        data = {"content": {"title": {"heading": f"Title {title_num}"}}}
+        # The list changes only when a title file is added, removed or
+        # rewritten, so one stat per file tells whether the cache is current
+        cache_key = tuple(sorted((json_file.name, json_file.stat().st_mtime_ns) for json_file in json_files))
 
-                # Extract the title name with fallback
-                try:
-                    title_name = data['content']['title']['heading'] if 'content' in data and 'title' in data['content'] and 'heading' in data['content']['title'] else f"Title {title_num}"
-                except Exception:
-                    title_name = f"Title {title_num}"
+        # Check and fill the cache under one lock, so concurrent requests
+        # build the list once and never see a half-updated entry
+        with all_titles_lock:
+            # Check cache first if enabled
+            if CACHE_ENABLED and use_cache and all_titles_cache['key'] == cache_key:
+                logger.debug("Using cached data for all titles")
+                return all_titles_cache['data']
 
-                titles.append({
-                    'number': title_num,
-                    'name': title_name
-                })
+            # Read the title headings concurrently, skipping non-title files
+            titles = [title for title in TITLE_POOL.map(title_listing_entry, json_files) if title]
 
-        # Sort titles by number
-        titles.sort(key=lambda x: x['number'])
+            # Sort titles by number
+            titles.sort(key=lambda x: x['number'])
 
-        # Cache the titles list if caching is enabled
-        if CACHE_ENABLED:
-            all_titles_cache['data'] = titles
-            all_titles_cache['timestamp'] = time.time()
-            logger.debug("Cached all titles list")
+            # Cache the titles list if caching is enabled
+            if CACHE_ENABLED:
+                all_titles_cache['data'] = titles
+                all_titles_cache['key'] = cache_key
+                logger.debug("Cached all titles list")
 
-        return titles
+            return titles
     except DataLoadError:
         # Re-raise this specific exception to be caught by the caller
         raise
@@ -435,7 +962,7 @@ def search_titles(query, filters=None, use_cache=True):
         # Parse the query for exact phrases (in quotes)
         exact_phrases = []
         query_without_quotes = query
-        for match in re.finditer(r'"([^"]+)"', query):
+        for match in QUOTED_PHRASE_RE.finditer(query):
             exact_phrase = match.group(1).lower()
             exact_phrases.append(exact_phrase)
             query_without_quotes = query_without_quotes.replace(f'"{exact_phrase}"', '')
@@ -443,6 +970,24 @@ def search_titles(query, filters=None, use_cache=True):
         # Get individual terms (excluding exact phrases)
         terms = [term.strip() for term in query_without_quotes.split() if term.strip()]
 
+        # Highlight every query string with one alternation, compiled once per
+        # query. Longest first, so a phrase wins over a term inside it instead
+        # of the term being wrapped in a second <mark>
+        alternatives = [(phrase, re.escape(phrase)) for phrase in exact_phrases]
+        alternatives += [(term, r'\b' + re.escape(term) + r'\b') for term in terms]
+        alternatives.sort(key=lambda alternative: len(alternative[0]), reverse=True)
+        highlight_pattern = re.compile('|'.join(pattern for _, pattern in alternatives), re.IGNORECASE)
+
+        # With several query strings, match them all in one pass per section
+        # instead of one substring scan each
+        automaton = None
+        needles = set(exact_phrases + terms)
+        if AHOCORASICK_AVAILABLE and len(needles) > 1:
+            automaton = ahocorasick.Automaton()
+            for needle in needles:
+                automaton.add_word(needle, needle)
+            automaton.make_automaton()
+
         # Initialize filters if not provided
         if filters is None:
             filters = {}
@@ -464,177 +1009,174 @@ def search_titles(query, filters=None, use_cache=True):
             logger.warning("No JSON files found in processed directory")
             return []
 
-        # Search each file for the query
-        results = []
-        for json_file in json_files:
-            match = re.search(r'usc(\d+)\.json', json_file.name)
-            if match:
-                title_num = int(match.group(1))
+        def match_title_name(title_num, title_name):
+            """The title-level result for a title whose name matches, or None"""
+            # Check if title matches any terms
+            title_text = title_name.lower()
+            title_matches = False
+            relevance_score = 0
+            matched_terms = set()
+
+            # Check for exact phrase matches in title
+            for phrase in exact_phrases:
+                if phrase in title_text:
+                    title_matches = True
+                    relevance_score += 8  # High score for title match
+                    matched_terms.add(phrase)
+
+            # Check for individual term matches in title
+            for term in terms:
+                if term in title_text:
+                    title_matches = True
+                    relevance_score += 4
+                    matched_terms.add(term)
+
+            if title_matches:
+                return {
+                    'title_num': title_num,
+                    'title_name': title_name,
+                    'heading': title_name,
+                    'snippet': f"Title contains the search term(s): {', '.join(matched_terms)}",
+                    'highlighted_snippet': f"Title contains the search term(s): {', '.join(['<mark>' + term + '</mark>' for term in matched_terms])}",
+                    'relevance_score': relevance_score,
+                    'matched_terms': list(matched_terms),
+                    'is_title_match': True
+                }
+            return None
 
-                # Skip if title doesn't match filter
-                if 'title_num' in filters and filters['title_num'] and title_num != filters['title_num']:
-                    continue
+        def search_title_file(json_file):
+            """Search one title file, returning its matches in document order"""
+            file_results = []
+            match = USC_JSON_RE.search(json_file.name)
+            if not match:
+                return file_results
 
-                # Load the title data, using cache if enabled
-                try:
-                    if use_cache and CACHE_ENABLED and title_num in title_cache:
-                        cache_entry = title_cache[title_num]
-                        if time.time() - cache_entry['timestamp'] < CACHE_TIMEOUT:
-                            data = cache_entry['data']
-                            logger.debug(f"Using cached data for title {title_num} in search")
-                        else:
-                            data = load_title_data(title_num, use_cache=False)
-                    else:
-                        try:
-                            with open(json_file, 'r', encoding='utf-8') as f:
-                                data = json.load(f)
-
-                            # Cache the data if caching is enabled
-                            if CACHE_ENABLED:
-                                title_cache[title_num] = {
-                                    'data': data,
-                                    'timestamp': time.time()
-                                }
-                        except UnicodeDecodeError as e:
-                            # Try with different encodings if UTF-8 fails
-                            logger.warning(f"UTF-8 decode error for {json_file.name} during search: {e}")
-                            try:
-                                with open(json_file, 'r', encoding='latin-1') as f:
-                                    data = json.load(f)
-                                logger.warning(f"Successfully loaded {json_file.name} with latin-1 encoding for search")
-
-                                # Cache the data if caching is enabled
-                                if CACHE_ENABLED:
-                                    title_cache[title_num] = {
-                                        'data': data,
-                                        'timestamp': time.time()
-                                    }
-                            except Exception as e2:
-                                logger.error(f"Error loading {json_file.name} with alternative encoding for search: {e2}")
-                                continue  # Skip this file
-
-                    # Extract title name with fallback
-                    try:
-                        title_name = data['content']['title']['heading'] if 'content' in data and 'title' in data['content'] and 'heading' in data['content']['title'] else f"Title {title_num}"
-                    except Exception:
-                        title_name = f"Title {title_num}"
+            title_num = int(match.group(1))
+
+            # Skip if title doesn't match filter
+            if 'title_num' in filters and filters['title_num'] and title_num != filters['title_num']:
+                return file_results
 
-                    # Find specific sections that match the query
-                    matching_sections = []
+            # A title whose vocabulary rules out every query string has no
+            # matching section, so only its name is left to check
+            try:
+                may_match = not (CACHE_ENABLED and use_cache) or title_may_match(json_file, needles)
+            except Exception:
+                may_match = True  # Let the load below report the error
+            if not may_match:
+                if not filters:
                     try:
-                        if 'content' in data and 'chapters' in data['content']:
-                            for chapter_idx, chapter in enumerate(data['content']['chapters']):
-                                chapter_num = chapter_idx + 1
-
-                                # Skip if chapter doesn't match filter
-                                if 'chapter_num' in filters and filters['chapter_num'] and chapter_num != filters['chapter_num']:
-                                    continue
-
-                                chapter_heading = chapter.get('heading', f"Chapter {chapter_num}")
-
-                                if 'sections' in chapter:
-                                    for section_idx, section in enumerate(chapter['sections']):
-                                        section_num = section_idx + 1
-
-                                        # Skip if section doesn't match filter
-                                        if 'section_num' in filters and filters['section_num'] and section_num != filters['section_num']:
-                                            continue
-
-                                        # Get section content and heading
-                                        content = section.get('content', '')
-                                        heading = section.get('heading', '')
-                                        section_text = f"{heading} {content}".lower()
-
-                                        # Calculate relevance score
-                                        relevance_score = 0
-                                        matched_terms = set()
-                                        highlighted_content = content
-
-                                        # Check for exact phrase matches
-                                        for phrase in exact_phrases:
-                                            if phrase in section_text:
-                                                relevance_score += 10  # Higher score for exact phrase matches
-                                                matched_terms.add(phrase)
-
-                                                # Create regex for highlighting that preserves case
-                                                pattern = re.compile(re.escape(phrase), re.IGNORECASE)
-                                                highlighted_content = pattern.sub(r'<mark>\g<0></mark>', highlighted_content)
-
-                                        # Check for individual term matches
-                                        for term in terms:
-                                            if term in section_text:
-                                                relevance_score += 5  # Base score for term match
-                                                matched_terms.add(term)
-
-                                                # Bonus for term in heading
-                                                if term in heading.lower():
-                                                    relevance_score += 3
-
-                                                # Create regex for highlighting that preserves case
-                                                pattern = re.compile(r'\b' + re.escape(term) + r'\b', re.IGNORECASE)
-                                                highlighted_content = pattern.sub(r'<mark>\g<0></mark>', highlighted_content)
-
-                                        # Only include results that match at least one term or phrase
-                                        if matched_terms:
-                                            # Create a snippet around the first match
-                                            snippet = create_snippet(content, list(matched_terms)[0], 150)
-                                            highlighted_snippet = create_snippet(highlighted_content, list(matched_terms)[0], 150)
-
-                                            matching_sections.append({
-                                                'title_num': title_num,
-                                                'title_name': title_name,
-                                                'chapter_num': chapter_num,
-                                                'chapter_heading': chapter_heading,
-                                                'section_num': section_num,
-                                                'heading': heading,
-                                                'snippet': snippet,
-                                                'highlighted_snippet': highlighted_snippet,
-                                                'relevance_score': relevance_score,
-                                                'matched_terms': list(matched_terms)
-                                            })
+                        title_name = read_title_heading(json_file)
                     except Exception as e:
-                        logger.warning(f"Error finding matching sections in {json_file.name}: {e}")
-                        logger.debug(f"Traceback: {traceback.format_exc()}")
-
-                    # If we found specific sections, add them to results
-                    if matching_sections:
-                        results.extend(matching_sections)
-                    elif not filters:  # Only add title-level match if no specific filters are applied
-                        # Check if title matches any terms
-                        title_text = title_name.lower()
-                        title_matches = False
+                        logger.error(f"Error loading {json_file.name} for search: {e}")
+                        title_name = None
+                    title_result = match_title_name(title_num, f"Title {title_num}" if title_name is None else title_name)
+                    if title_result:
+                        file_results.append(title_result)
+                return file_results
+
+            # Load the title data, using cache if enabled
+            try:
+                data, rows = read_title_for_search(json_file, use_cache)
+            except Exception as e:
+                logger.error(f"Error loading {json_file.name} for search: {e}")
+                return file_results  # Skip this file
+
+            try:
+                # Only scan the sections the index says can match
+                candidates = rows.candidates(exact_phrases + terms)
+
+                # Extract title name with fallback
+                try:
+                    title_name = data['content']['title']['heading'] if 'content' in data and 'title' in data['content'] and 'heading' in data['content']['title'] else f"Title {title_num}"
+                except Exception:
+                    title_name = f"Title {title_num}"
+
+                chapter_filter = filters.get('chapter_num')
+                section_filter = filters.get('section_num')
+
+                # Find specific sections that match the query, row by row
+                matching_sections = []
+                try:
+                    for row in (range(len(rows)) if candidates is None else sorted(candidates)):
+                        # Skip if chapter or section doesn't match filter
+                        if chapter_filter and rows.chapter_nums[row] != chapter_filter:
+                            continue
+                        if section_filter and rows.section_nums[row] != section_filter:
+                            continue
+
+                        section_text = rows.texts[row]
+
+                        # The query strings found in one pass, or else the text
+                        # itself: 'in' below works on either
+                        if automaton:
+                            present = {needle for _, needle in automaton.iter(section_text)}
+                        else:
+                            present = section_text
+
+                        # Calculate relevance score
                         relevance_score = 0
                         matched_terms = set()
 
-                        # Check for exact phrase matches in title
+                        # Check for exact phrase matches
                         for phrase in exact_phrases:
-                            if phrase in title_text:
-                                title_matches = True
-                                relevance_score += 8  # High score for title match
+                            if phrase in present:
+                                relevance_score += 10  # Higher score for exact phrase matches
                                 matched_terms.add(phrase)
 
-                        # Check for individual term matches in title
+                        # Check for individual term matches
                         for term in terms:
-                            if term in title_text:
-                                title_matches = True
-                                relevance_score += 4
+                            if term in present:
+                                relevance_score += 5  # Base score for term match
                                 matched_terms.add(term)
 
-                        if title_matches:
-                            results.append({
+                                # Bonus for term in heading
+                                if term in rows.headings_lower[row]:
+                                    relevance_score += 3
+
+                        # Only include results that match at least one term or phrase
+                        if matched_terms:
+                            # Create a snippet around the first match, then
+                            # highlight all matches within it in one pass,
+                            # preserving case
+                            snippet = create_snippet(rows.contents[row], list(matched_terms)[0], 150)
+                            highlighted_snippet = highlight_pattern.sub(r'<mark>\g<0></mark>', snippet)
+
+                            matching_sections.append({
                                 'title_num': title_num,
                                 'title_name': title_name,
-                                'heading': title_name,
-                                'snippet': f"Title contains the search term(s): {', '.join(matched_terms)}",
-                                'highlighted_snippet': f"Title contains the search term(s): {', '.join(['<mark>' + term + '</mark>' for term in matched_terms])}",
+                                'chapter_num': rows.chapter_nums[row],
+                                'chapter_heading': rows.chapter_headings[row],
+                                'section_num': rows.section_nums[row],
+                                'heading': rows.headings[row],
+                                'snippet': snippet,
+                                'highlighted_snippet': highlighted_snippet,
                                 'relevance_score': relevance_score,
-                                'matched_terms': list(matched_terms),
-                                'is_title_match': True
+                                'matched_terms': list(matched_terms)
                             })
                 except Exception as e:
-                    logger.error(f"Error searching title {title_num}: {e}")
+                    logger.warning(f"Error finding matching sections in {json_file.name}: {e}")
                     logger.debug(f"Traceback: {traceback.format_exc()}")
 
+                # If we found specific sections, add them to results
+                if matching_sections:
+                    file_results.extend(matching_sections)
+                elif not filters:  # Only add title-level match if no specific filters are applied
+                    title_result = match_title_name(title_num, title_name)
+                    if title_result:
+                        file_results.append(title_result)
+            except Exception as e:
+                logger.error(f"Error searching title {title_num}: {e}")
+                logger.debug(f"Traceback: {traceback.format_exc()}")
+
+            return file_results
+
+        # Search the title files concurrently; map() hands the per-file
+        # results back in file order, so ties keep the order the sort saw
+        results = []
+        for file_results in TITLE_POOL.map(search_title_file, json_files):
+            results.extend(file_results)
+
         # Sort results by relevance score (descending)
         results.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
         return results
@@ -706,11 +1248,13 @@ def index():
         return render_template('error_modern.html', message="Error loading titles. Please try again later."), 500
 
 @app.route('/title/<int:title_num>')
+@title_etag
 @cache_control(max_age=3600)  # Cache for 1 hour
+@cached_title_page
 def title(title_num):
     """Title page"""
     try:
-        data = load_title_data(title_num)
+        data = load_title_data(title_num, sections=False)
         if not data:
             return render_template('error_modern.html', message=f"Title {title_num} not found"), 404
 
@@ -727,11 +1271,13 @@ def title(title_num):
         return render_template('error_modern.html', message="An unexpected error occurred. Please try again later."), 500
 
 @app.route('/chapter/<int:title_num>/<int:chapter_num>')
+@title_etag
 @cache_control(max_age=3600)  # Cache for 1 hour
+@cached_title_page
 def chapter(title_num, chapter_num):
     """Chapter page"""
     try:
-        data = load_title_data(title_num)
+        data = load_title_data(title_num, sections=False)
         if not data:
             return render_template('error_modern.html', message=f"Title {title_num} not found"), 404
     except (DataLoadError, EncodingError) as e:
@@ -742,26 +1288,18 @@ def chapter(title_num, chapter_num):
         logger.debug(f"Traceback: {traceback.format_exc()}")
         return render_template('error_modern.html', message="An unexpected error occurred. Please try again later."), 500
 
-    # Find the chapter
+    # Find the chapter by the number in its num field
     try:
-        chapter_data = None
-        for chapter in data['content']['chapters']:
-            try:
-                # Try to extract chapter number from the chapter num field
-                chapter_match = re.search(r'CHAPTER (\d+)', chapter.get('num', ''))
-                if chapter_match and chapter_num == int(chapter_match.group(1)):
-                    chapter_data = chapter
-                    break
-            except (AttributeError, ValueError, TypeError) as e:
-                # If we can't parse the chapter number, try using the index
-                logger.warning(f"Error parsing chapter number in title {title_num}: {e}")
-                continue
+        chapters = data['content']['chapters']
+        chapter_idx = title_numbering(title_num).chapters.get(chapter_num)
 
         # If we didn't find the chapter by number, try using the index
-        if not chapter_data and 0 <= chapter_num - 1 < len(data['content']['chapters']):
-            chapter_data = data['content']['chapters'][chapter_num - 1]
+        if chapter_idx is None and 0 <= chapter_num - 1 < len(chapters):
+            chapter_idx = chapter_num - 1
             logger.info(f"Using index-based lookup for chapter {chapter_num} in title {title_num}")
 
+        chapter_data = chapters[chapter_idx] if chapter_idx is not None else None
+
         if not chapter_data:
             return render_template('error_modern.html', message=f"Chapter {chapter_num} not found in Title {title_num}"), 404
 
@@ -772,7 +1310,9 @@ def chapter(title_num, chapter_num):
         return render_template('error_modern.html', message=f"Error processing Chapter {chapter_num}. Please try again later."), 500
 
 @app.route('/section/<int:title_num>/<int:chapter_num>/<int:section_num>')
+@title_etag
 @cache_control(max_age=3600)  # Cache for 1 hour
+@cached_title_page
 def section(title_num, chapter_num, section_num):
     """Section page"""
     try:
@@ -789,48 +1329,37 @@ def section(title_num, chapter_num, section_num):
             logger.debug(f"Traceback: {traceback.format_exc()}")
             return render_template('error_modern.html', message="An unexpected error occurred. Please try again later."), 500
 
-        # Find the chapter
+        # Find the chapter by the number in its num field
         try:
-            chapter_data = None
-            for chapter in data['content']['chapters']:
-                try:
-                    # Try to extract chapter number from the chapter num field
-                    chapter_match = re.search(r'CHAPTER (\d+)', chapter.get('num', ''))
-                    if chapter_match and chapter_num == int(chapter_match.group(1)):
-                        chapter_data = chapter
-                        break
-                except (AttributeError, ValueError, TypeError):
-                    continue
+            numbering = title_numbering(title_num)
+            chapters = data['content']['chapters']
+            chapter_idx = numbering.chapters.get(chapter_num)
 
             # If we didn't find the chapter by number, try using the index
-            if not chapter_data and 0 <= chapter_num - 1 < len(data['content']['chapters']):
-                chapter_data = data['content']['chapters'][chapter_num - 1]
+            if chapter_idx is None and 0 <= chapter_num - 1 < len(chapters):
+                chapter_idx = chapter_num - 1
                 logger.info(f"Using index-based lookup for chapter {chapter_num} in title {title_num}")
 
+            chapter_data = chapters[chapter_idx] if chapter_idx is not None else None
+
             if not chapter_data:
                 return render_template('error_modern.html', message=f"Chapter {chapter_num} not found in Title {title_num}"), 404
         except Exception as e:
             logger.error(f"Error finding chapter {chapter_num} in title {title_num}: {e}")
             return render_template('error_modern.html', message=f"Error processing Chapter {chapter_num}. Please try again later."), 500
 
-        # Find the section
+        # Find the section by the number in its num field
         try:
-            section_data = None
-            for section in chapter_data.get('sections', []):
-                try:
-                    # Try to extract section number from the section num field
-                    section_match = re.search(r'\u00a7\s*(\d+)', section.get('num', ''))
-                    if section_match and section_num == int(section_match.group(1)):
-                        section_data = section
-                        break
-                except (AttributeError, ValueError, TypeError):
-                    continue
+            sections = chapter_data.get('sections', [])
+            section_idx = numbering.sections.get((chapter_idx, section_num))
 
             # If we didn't find the section by number, try using the index
-            if not section_data and 0 <= section_num - 1 < len(chapter_data.get('sections', [])):
-                section_data = chapter_data['sections'][section_num - 1]
+            if section_idx is None and 0 <= section_num - 1 < len(sections):
+                section_idx = section_num - 1
                 logger.info(f"Using index-based lookup for section {section_num} in chapter {chapter_num} of title {title_num}")
 
+            section_data = sections[section_idx] if section_idx is not None else None
+
             if not section_data:
                 return render_template('error_modern.html', message=f"Section {section_num} not found in Chapter {chapter_num} of Title {title_num}"), 404
 
@@ -884,13 +1413,24 @@ def search():
                 results.sort(key=lambda x: (x.get('title_num', 0), x.get('chapter_num', 0), x.get('section_num', 0)))
             # Default is already sorted by relevance
 
-            # Get statistics for the search results
+            # Get statistics for the search results in one pass
+            title_matches = 0
+            titles_found = set()
+            chapters_found = set()
+            for r in results:
+                if r.get('is_title_match', False):
+                    title_matches += 1
+                title_num = r.get('title_num', 0)
+                titles_found.add(title_num)
+                if 'chapter_num' in r:
+                    chapters_found.add((title_num, r['chapter_num']))
+
             stats = {
                 'total_results': len(results),
-                'title_matches': sum(1 for r in results if r.get('is_title_match', False)),
-                'section_matches': sum(1 for r in results if not r.get('is_title_match', False)),
-                'titles_found': len(set(r.get('title_num', 0) for r in results)),
-                'chapters_found': len(set((r.get('title_num', 0), r.get('chapter_num', 0)) for r in results if 'chapter_num' in r)),
+                'title_matches': title_matches,
+                'section_matches': len(results) - title_matches,
+                'titles_found': len(titles_found),
+                'chapters_found': len(chapters_found),
             }
 
             return render_template(
@@ -924,14 +1464,18 @@ def search():
 def api_search_suggestions():
     """API endpoint to get search suggestions"""
     try:
-        query = request.args.get('q', '').lower().strip()
+        query = request.args.get('q', '').lower().strip()[:SUGGESTION_QUERY_MAX_LENGTH]
         if not query or len(query) < 2:  # Require at least 2 characters
             return jsonify({'suggestions': []})
 
+        # Nothing but punctuation and spaces can't usefully match a heading
+        if not SEARCH_WORD_RE.search(query):
+            return jsonify({'suggestions': []})
+
         # Get all titles
         all_titles = get_all_titles()
 
-        # Find matching titles
+        # Find matching titles, up to the top 5
         title_suggestions = []
         for title in all_titles:
             title_name = title.get('name', '').lower()
@@ -941,56 +1485,43 @@ def api_search_suggestions():
                     'title_num': title.get('number'),
                     'text': f"Title {title.get('number')}: {title.get('name')}"
                 })
-
-        # Limit to top 5 title suggestions
-        title_suggestions = title_suggestions[:5]
+                if len(title_suggestions) >= 5:
+                    break
 
         # If we have a specific title in the query, try to find matching chapters and sections
         chapter_suggestions = []
         section_suggestions = []
 
         # Look for title number pattern in query (e.g., "title 5" or "t5")
-        title_match = re.search(r'(?:title|t)[\s]*?(\d+)', query)
+        title_match = TITLE_IN_QUERY_RE.search(query)
         if title_match:
             title_num = int(title_match.group(1))
 
             # Load the title data
-            title_data = load_title_data(title_num)
-            if title_data and 'content' in title_data and 'chapters' in title_data['content']:
+            title_data = load_title_data(title_num, sections=False)
+            # Remove the title number from the query for better matching
+            clean_query = query.replace(title_match.group(0), '').strip()
+            if clean_query and title_data and 'content' in title_data and 'chapters' in title_data['content']:
+                headings = title_headings(title_num)
+
                 # Find matching chapters
-                for chapter_idx, chapter in enumerate(title_data['content']['chapters']):
-                    chapter_num = chapter_idx + 1
-                    chapter_heading = chapter.get('heading', '').lower()
-
-                    # Remove the title number from the query for better matching
-                    clean_query = query.replace(title_match.group(0), '').strip()
-
-                    if clean_query and clean_query in chapter_heading:
-                        chapter_suggestions.append({
-                            'type': 'chapter',
-                            'title_num': title_num,
-                            'chapter_num': chapter_num,
-                            'text': f"Title {title_num}, Chapter {chapter_num}: {chapter.get('heading')}"
-                        })
-
-                    # Find matching sections if we have a chapter match
-                    if 'sections' in chapter:
-                        for section_idx, section in enumerate(chapter['sections']):
-                            section_num = section_idx + 1
-                            section_heading = section.get('heading', '').lower()
-
-                            if clean_query and clean_query in section_heading:
-                                section_suggestions.append({
-                                    'type': 'section',
-                                    'title_num': title_num,
-                                    'chapter_num': chapter_num,
-                                    'section_num': section_num,
-                                    'text': f"Title {title_num}, Chapter {chapter_num}, Section {section_num}: {section.get('heading')}"
-                                })
-
-        # Limit suggestions
-        chapter_suggestions = chapter_suggestions[:3]
-        section_suggestions = section_suggestions[:5]
+                for chapter_num, heading, _ in headings.matching_chapters(clean_query, 3):
+                    chapter_suggestions.append({
+                        'type': 'chapter',
+                        'title_num': title_num,
+                        'chapter_num': chapter_num,
+                        'text': f"Title {title_num}, Chapter {chapter_num}: {heading}"
+                    })
+
+                # Find matching sections
+                for chapter_num, section_num, heading, _ in headings.matching_sections(clean_query, 5):
+                    section_suggestions.append({
+                        'type': 'section',
+                        'title_num': title_num,
+                        'chapter_num': chapter_num,
+                        'section_num': section_num,
+                        'text': f"Title {title_num}, Chapter {chapter_num}, Section {section_num}: {heading}"
+                    })
 
         # Combine all suggestions
         all_suggestions = title_suggestions + chapter_suggestions + section_suggestions
@@ -1010,21 +1541,23 @@ def api_search_suggestions():
 
 # API endpoints for lazy loading
 @app.route('/api/title/<int:title_num>/chapters')
+@title_etag
 @cache_control(max_age=3600)  # Cache for 1 hour
 def api_title_chapters(title_num):
     """API endpoint to get chapters for a title"""
     try:
-        data = load_title_data(title_num)
+        data = load_title_data(title_num, sections=False)
         if not data or 'content' not in data or 'chapters' not in data['content']:
             return jsonify({'error': f"Title {title_num} not found or has no chapters"}), 404
 
         # Extract just the chapter data we need
         chapters = []
-        for idx, chapter in enumerate(data['content']['chapters']):
+        for num, chapter in enumerate(data['content']['chapters'], 1):
+            fallback = f"Chapter {num}"
             chapters.append({
-                'num': idx + 1,  # Use index as chapter number for simplicity
-                'heading': chapter.get('heading', f"Chapter {idx + 1}"),
-                'display_num': chapter.get('num', f"Chapter {idx + 1}")
+                'num': num,  # Use index as chapter number for simplicity
+                'heading': chapter.get('heading', fallback),
+                'display_num': chapter.get('num', fallback)
             })
 
         return jsonify({'chapters': chapters})
@@ -1034,29 +1567,32 @@ def api_title_chapters(title_num):
         return jsonify({'error': "An unexpected error occurred"}), 500
 
 @app.route('/api/title/<int:title_num>/chapter/<int:chapter_num>/sections')
+@title_etag
 @cache_control(max_age=3600)  # Cache for 1 hour
 def api_chapter_sections(title_num, chapter_num):
     """API endpoint to get sections for a chapter"""
     try:
-        data = load_title_data(title_num)
+        data = load_title_data(title_num, sections=False)
         if not data or 'content' not in data or 'chapters' not in data['content']:
             return jsonify({'error': f"Title {title_num} not found"}), 404
 
         # Find the chapter
+        chapters = data['content']['chapters']
         chapter_data = None
-        if 0 <= chapter_num - 1 < len(data['content']['chapters']):
-            chapter_data = data['content']['chapters'][chapter_num - 1]
+        if 0 <= chapter_num - 1 < len(chapters):
+            chapter_data = chapters[chapter_num - 1]
 
         if not chapter_data or 'sections' not in chapter_data:
             return jsonify({'error': f"Chapter {chapter_num} not found in Title {title_num} or has no sections"}), 404
 
         # Extract just the section data we need
         sections = []
-        for idx, section in enumerate(chapter_data['sections']):
+        for num, section in enumerate(chapter_data['sections'], 1):
+            fallback = f"Section {num}"
             sections.append({
-                'num': idx + 1,  # Use index as section number for simplicity
-                'heading': section.get('heading', f"Section {idx + 1}"),
-                'display_num': section.get('num', f"Section {idx + 1}")
+                'num': num,  # Use index as section number for simplicity
+                'heading': section.get('heading', fallback),
+                'display_num': section.get('num', fallback)
             })
 
         return jsonify({'sections': sections})
@@ -1087,17 +1623,16 @@ def updates():
             # Get all changelog files
             changes_dir = Path("update_data/changes")
             if changes_dir.exists():
-                changelog_files = list(changes_dir.glob("changelog_*.json"))
-
-                # Sort by modification time (newest first)
-                changelog_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-
-                # Load the changelogs
-                for file in changelog_files[:5]:  # Show only the 5 most recent updates
+                # scandir entries carry their own stat, unlike glob + Path.stat
+                with os.scandir(changes_dir) as it:
+                    changelog_files = [(entry.stat().st_mtime, entry.path) for entry in it
+                                       if fnmatch.fnmatch(entry.name, "changelog_*.json") and entry.is_file()]
+
+                # Load the changelogs, newest first; only the 5 most recent
+                # updates are shown, so only those are picked out of the rest
+                for _, file in heapq.nlargest(5, changelog_files):
                     try:
-                        with open(file, 'r') as f:
-                            changelog = json.load(f)
-                            updates_list.append(changelog)
+                        updates_list.append(load_json_file(Path(file)))
                     except Exception as e:
                         logger.error(f"Error loading changelog file {file}: {e}")
         except Exception as e:
@@ -1120,6 +1655,77 @@ def updates():
         logger.debug(f"Traceback: {traceback.format_exc()}")
         return render_template('error_modern.html', message="An unexpected error occurred. Please try again later."), 500
 
+@coalesced_lru_cache(maxsize=DIFF_CACHE_SIZE)
+def _title_diff(title_num, old_version, new_version, inline, versions_key):
+    """Compare two versions of a title and render the diff HTML
+
+    Cached per comparison and view (inline or side by side); versions_key
+    holds the mtimes of the files both versions resolve to, so a re-ingested
+    version is diffed again.
+    """
+    # Compare the versions
+    diff_summary = None
+    diff_data = diff_visualizer.compare_title_versions(title_num, old_version, new_version)
+
+    if diff_data:
+        # Generate HTML for each section diff, counting the summary
+        # statistics in the same pass
+        added_sections = 0
+        deleted_sections = 0
+        modified_sections = 0
+
+        for chapter in diff_data.get('chapter_diffs', []):
+            for section in chapter.get('section_diffs', []):
+                status = section.get('status')
+                if status == 'added':
+                    added_sections += 1
+                elif status == 'deleted':
+                    deleted_sections += 1
+                elif status == 'modified':
+                    modified_sections += 1
+
+                # Generate HTML for content diff
+                if section.get('content_diff'):
+                    section['content_diff_html'] = diff_visualizer.generate_html_diff(
+                        section['content_diff'],
+                        inline=inline
+                    )
+
+                # Generate HTML for subsection diffs
+                for subsection in section.get('subsection_diffs', []):
+                    if subsection.get('diff'):
+                        subsection['diff_html'] = diff_visualizer.generate_html_diff(
+                            subsection['diff'],
+                            inline=inline
+                        )
+
+        diff_summary = {
+            'added_sections': added_sections,
+            'deleted_sections': deleted_sections,
+            'modified_sections': modified_sections,
+            'total_changes': added_sections + deleted_sections + modified_sections
+        }
+
+    return diff_data, diff_summary
+
+def title_version_key(title_num, version):
+    """The file a title version is loaded from and its mtime, as DiffVisualizer resolves it
+
+    Args:
+        title_num (int): Title number
+        version (str): Version identifier, or "current"
+
+    Returns:
+        tuple: (file name, st_mtime_ns), or None if neither file exists
+    """
+    title_str = str(title_num).zfill(2)
+    for json_path in (Path("processed") / f"usc{title_str}_{version}.json", Path("processed") / f"usc{title_str}.json"):
+        try:
+            return json_path.name, json_path.stat().st_mtime_ns
+        except OSError:
+            continue
+    return None
+
 @app.route('/diff/<int:title_num>')
 @cache_control(max_age=3600)  # Cache for 1 hour
 def diff_view(title_num):
@@ -1142,48 +1748,9 @@ def diff_view(title_num):
         diff_summary = None
 
         if old_version != new_version and old_version in available_versions and new_version in available_versions:
-            # Compare the versions
-            diff_data = diff_visualizer.compare_title_versions(title_num, old_version, new_version)
-
-            if diff_data:
-                # Generate HTML for each section diff
-                for chapter in diff_data.get('chapter_diffs', []):
-                    for section in chapter.get('section_diffs', []):
-                        # Generate HTML for content diff
-                        if section.get('content_diff'):
-                            section['content_diff_html'] = diff_visualizer.generate_html_diff(
-                                section['content_diff'],
-                                inline=(view_mode == 'inline')
-                            )
-
-                        # Generate HTML for subsection diffs
-                        for subsection in section.get('subsection_diffs', []):
-                            if subsection.get('diff'):
-                                subsection['diff_html'] = diff_visualizer.generate_html_diff(
-                                    subsection['diff'],
-                                    inline=(view_mode == 'inline')
-                                )
-
-                # Generate summary statistics
-                added_sections = 0
-                deleted_sections = 0
-                modified_sections = 0
-
-                for chapter in diff_data.get('chapter_diffs', []):
-                    for section in chapter.get('section_diffs', []):
-                        if section.get('status') == 'added':
-                            added_sections += 1
-                        elif section.get('status') == 'deleted':
-                            deleted_sections += 1
-                        elif section.get('status') == 'modified':
-                            modified_sections += 1
-
-                diff_summary = {
-                    'added_sections': added_sections,
-                    'deleted_sections': deleted_sections,
-                    'modified_sections': modified_sections,
-                    'total_changes': added_sections + deleted_sections + modified_sections
-                }
+            # Compare the versions, reusing the diff until either file changes
+            versions_key = (title_version_key(title_num, old_version), title_version_key(title_num, new_version))
+            diff_data, diff_summary = _title_diff(title_num, old_version, new_version, view_mode == 'inline', versions_key)
 
         return render_template(
             'diff_view.html',
@@ -1265,6 +1832,7 @@ def api_webhooks():
             secret = data.get('secret')
             format = data.get('format', 'json')
             headers = data.get('headers')
+            batching = data.get('batching')
 
             webhook_id = webhook_manager.register_webhook(
                 url=url,
@@ -1272,7 +1840,8 @@ def api_webhooks():
                 events=events,
                 secret=secret,
                 format=format,
-                headers=headers
+                headers=headers,
+                batching=batching
             )
 
             if webhook_id:
@@ -1309,7 +1878,7 @@ def api_webhook(webhook_id):
 
             # Extract fields to update
             update_fields = {}
-            for field in ['url', 'description', 'events', 'secret', 'format', 'headers', 'active']:
+            for field in ['url', 'description', 'events', 'secret', 'format', 'headers', 'batching', 'active']:
                 if field in data:
                     update_fields[field] = data[field]
 
@@ -11,57 +11,275 @@ This module provides webhook integration for the US Code Browser, allowing:
 import json
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 import hmac
 import hashlib
+import heapq
+import os
+import secrets
+import sqlite3
 import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from threading import Thread
+from threading import Condition, Lock, Thread
 from queue import Queue
 
-# Configure logging
-log_dir = Path("logs")
-log_dir.mkdir(exist_ok=True)
+# Build XML payloads with lxml when available, else the standard library
+try:
+    from lxml import etree as ET
+    LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    LXML_AVAILABLE = False
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(log_dir / f'webhook_manager_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
-    ]
-)
+# orjson serializes payloads and delivery log lines faster, straight to bytes
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
+# Logging is configured by the CLI below; when imported, records go to the
+# importing application's handlers
 logger = logging.getLogger('webhook_manager')
 
+# Webhook registrations. Events are kept as a JSON list (to return them in
+# the order given) and again one row per event in webhook_events, whose index
+# lets trigger_webhooks find an event's subscribers without reading the rest.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhooks (
+    id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    description TEXT,
+    events TEXT NOT NULL,
+    secret TEXT,
+    format TEXT NOT NULL,
+    headers TEXT NOT NULL,
+    batching TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    active INTEGER NOT NULL DEFAULT 1,
+    total_deliveries INTEGER NOT NULL DEFAULT 0,
+    successful_deliveries INTEGER NOT NULL DEFAULT 0,
+    failed_deliveries INTEGER NOT NULL DEFAULT 0,
+    last_delivery_at TEXT,
+    last_delivery_status TEXT
+);
+CREATE TABLE IF NOT EXISTS webhook_events (
+    webhook_id TEXT NOT NULL,
+    event TEXT NOT NULL,
+    PRIMARY KEY (webhook_id, event)
+);
+CREATE INDEX IF NOT EXISTS webhook_events_event ON webhook_events (event);
+"""
+
+def json_bytes(data):
+    """Serialize data to UTF-8 encoded JSON, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data).encode('utf-8')
+
+def create_delivery_session(pool_maxsize):
+    """Create a keep-alive session for webhook deliveries
+    
+    The adapter doesn't retry: failed deliveries are retried by the manager
+    after retry_delay_seconds.
+    
+    Args:
+        pool_maxsize (int): Connections kept open per host
+        
+    Returns:
+        requests.Session: Session with a pooled adapter for http and https
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=64, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+# Delivery workers when neither the caller, WEBHOOK_WORKERS nor the config
+# sets a count. Workers spend their time waiting on remote endpoints, so
+# there are more of them than CPUs.
+DEFAULT_WORKER_THREADS = max(8, 2 * (os.cpu_count() or 1))
+
+# Digests for the supported signature_algorithm settings
+SIGNATURE_DIGESTS = {
+    'sha256': hashlib.sha256,
+    'sha1': hashlib.sha1,
+}
+
+def nullable_str(value):
+    """Store a nullable text column, keeping None as NULL rather than 'None'"""
+    return None if value is None else str(value)
+
+# Webhook fields update_webhook may change, and how each is stored
+UPDATABLE_FIELDS = {
+    'url': str,
+    'description': nullable_str,
+    'events': lambda value: json.dumps(value or []),
+    'secret': nullable_str,
+    'format': str,
+    'headers': lambda value: json.dumps(value or {}),
+    'batching': json.dumps,
+    'active': int,
+}
+
+# Used for settings missing from a webhook's batching dict
+DEFAULT_BATCH_MAX_EVENTS = 100
+DEFAULT_BATCH_MAX_WAIT_MS = 1000
+
+class Delivery:
+    """One delivery of an event to a webhook, held in memory until it's done
+    
+    body is the payload already formatted for the webhook; deliveries of
+    the same event in the same format share one bytes object.
+    """
+    
+    __slots__ = ('id', 'webhook_id', 'event', 'format', 'body', 'batched',
+                 'created_at', 'attempts', 'max_attempts')
+    
+    def __init__(self, webhook_id, event, format, body, max_attempts, batched=False):
+        self.id = str(uuid.uuid4())
+        self.webhook_id = webhook_id
+        self.event = event
+        self.format = format
+        self.body = body
+        self.batched = batched
+        self.created_at = datetime.now().isoformat()
+        self.attempts = 0
+        self.max_attempts = max_attempts
+
+class PendingBatch:
+    """Events buffered for a batching webhook until the batch is sent"""
+    
+    __slots__ = ('id', 'webhook_id', 'events')
+    
+    def __init__(self, webhook_id):
+        self.id = str(uuid.uuid4())
+        self.webhook_id = webhook_id
+        self.events = []
+
+class DeliveryTarget:
+    """What delivering to a webhook needs, prepared once when it's loaded
+    
+    Attributes:
+        url (str): The webhook URL
+        headers (dict): The webhook's custom headers
+        signer (hmac.HMAC): HMAC keyed with the webhook secret, or None
+    """
+    
+    __slots__ = ('url', 'headers', 'signer')
+    
+    def __init__(self, url, headers, signer):
+        self.url = url
+        self.headers = headers
+        self.signer = signer
+
+class TokenBucket:
+    """Rate limit of `rate` requests per `period` seconds, allowing bursts of `rate`"""
+    
+    __slots__ = ('capacity', 'refill_rate', 'tokens', 'updated')
+    
+    def __init__(self, rate, period):
+        self.capacity = rate
+        self.refill_rate = rate / period
+        self.tokens = rate
+        self.updated = time.monotonic()
+    
+    def wait_time(self):
+        """Seconds until a request is allowed, 0 if one is allowed now"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+        
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.refill_rate
+    
+    def take(self):
+        """Use up one request, after wait_time has returned 0"""
+        self.tokens -= 1
+
+class CircuitBreaker:
+    """Tracks a webhook's consecutive failures to stop sending to a dead endpoint
+    
+    After `threshold` failures in a row the circuit opens for `open_seconds`.
+    Once that's up one delivery is tried; if it fails too the circuit opens
+    again straight away, and a success closes it.
+    """
+    
+    __slots__ = ('failures', 'open_until')
+    
+    def __init__(self):
+        self.failures = 0
+        self.open_until = 0.0
+    
+    def is_open(self):
+        return time.monotonic() < self.open_until
+    
+    def record(self, success, threshold, open_seconds):
+        if success:
+            self.failures = 0
+        else:
+            self.failures += 1
+            if self.failures >= threshold:
+                self.open_until = time.monotonic() + open_seconds
+
 class WebhookManager:
     """Manages webhook registrations and delivery for US Code updates"""
     
-    def __init__(self, data_dir="webhook_data", worker_threads=2):
+    def __init__(self, data_dir="webhook_data", worker_threads=None, session=None):
         """Initialize the webhook manager
         
         Args:
             data_dir (str): Directory to store webhook data
-            worker_threads (int): Number of worker threads for webhook delivery
+            worker_threads (int): Number of worker threads for webhook delivery,
+                defaults to the WEBHOOK_WORKERS environment variable, then
+                delivery.worker_threads in the config, then DEFAULT_WORKER_THREADS
+            session (requests.Session): Session for deliveries, defaults to a
+                keep-alive session with a connection per worker for each host
         """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         
         # Create subdirectories
         self.webhooks_dir = self.data_dir / "webhooks"
-        self.delivery_dir = self.data_dir / "delivery"
         self.logs_dir = self.data_dir / "logs"
         
         self.webhooks_dir.mkdir(exist_ok=True)
-        self.delivery_dir.mkdir(exist_ok=True)
         self.logs_dir.mkdir(exist_ok=True)
         
         # Load configuration
         self.config = self._load_config()
         
-        # Set up delivery queue and workers
-        self.delivery_queue = Queue()
+        # Open the webhook database, picking up any webhooks still stored
+        # as one JSON file each
+        self.db_lock = Lock()
+        self.db = self._open_database()
+        self._import_webhook_files()
+        
+        # DeliveryTargets by webhook ID. Emptied whenever the database's
+        # data_version shows a commit from another connection (such as
+        # another server process)
+        self.webhook_cache = {}
+        self.db_version = None
+        
+        # Deliveries are queued in memory; each status change is appended as
+        # one line to the delivery log rather than rewriting a record file
+        self.delivery_log = open(self.logs_dir / "deliveries.jsonl", 'ab', buffering=0)
+        self.delivery_log_lock = Lock()
+        
+        if worker_threads is None:
+            worker_threads = self._configured_worker_threads()
+        
+        # Deliveries to the same host reuse open connections
+        self.session = session or create_delivery_session(worker_threads)
+        
+        # Set up delivery queue and workers. With a max_queue_size set,
+        # trigger_webhooks blocks while the queue is full instead of letting
+        # a backlog grow without limit
+        self.delivery_queue = Queue(maxsize=self.config['delivery'].get('max_queue_size', 0))
         self.workers = []
         
         # Start worker threads
@@ -69,6 +287,41 @@ class WebhookManager:
             worker = Thread(target=self._delivery_worker, daemon=True)
             worker.start()
             self.workers.append(worker)
+        
+        # Rate limits (per minute and per hour) and circuit breakers by
+        # webhook ID, created on first delivery
+        self.rate_limits = {}
+        self.breakers = {}
+        self.limits_lock = Lock()
+        
+        # Events waiting to be sent together, by webhook ID, for webhooks
+        # with batching enabled
+        self.batches = {}
+        self.batch_lock = Lock()
+        
+        # Failed deliveries waiting out their retry delay, as (due time,
+        # delivery ID, delivery) on a heap that one scheduler thread serves.
+        # Batches wait on it too, as (send time, batch ID, PendingBatch)
+        self.retry_heap = []
+        self.retry_condition = Condition()
+        self.retry_scheduler = Thread(target=self._retry_scheduler, daemon=True)
+        self.retry_scheduler.start()
+    
+    def _configured_worker_threads(self):
+        """Get the delivery worker count from the environment or config
+        
+        Returns:
+            int: Number of worker threads
+        """
+        value = os.environ.get('WEBHOOK_WORKERS') or self.config['delivery'].get('worker_threads')
+        
+        if value:
+            try:
+                return max(1, int(value))
+            except ValueError:
+                logger.warning(f"Invalid webhook worker count: {value}, using {DEFAULT_WORKER_THREADS}")
+        
+        return DEFAULT_WORKER_THREADS
     
     def _load_config(self):
         """Load configuration from config file"""
@@ -87,7 +340,9 @@ class WebhookManager:
                 "max_retries": 3,
                 "retry_delay_seconds": 60,
                 "timeout_seconds": 10,
-                "max_payload_size_kb": 512
+                "max_payload_size_kb": 512,
+                "worker_threads": None,
+                "max_queue_size": 0
             },
             "security": {
                 "sign_payloads": True,
@@ -98,6 +353,10 @@ class WebhookManager:
                 "enabled": True,
                 "max_per_minute": 60,
                 "max_per_hour": 1000
+            },
+            "circuit_breaker": {
+                "failure_threshold": 5,
+                "open_seconds": 60
             }
         }
         
@@ -107,6 +366,160 @@ class WebhookManager:
         
         return default_config
     
+    def _open_database(self):
+        """Open the webhook database, creating its tables if needed
+        
+        Returns:
+            sqlite3.Connection: Connection shared by all threads; use it
+            while holding self.db_lock
+        """
+        db = sqlite3.connect(
+            self.data_dir / "webhooks.db",
+            check_same_thread=False,
+            isolation_level=None
+        )
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(SCHEMA)
+        
+        # Databases created before batching was added lack its column
+        columns = [row['name'] for row in db.execute("PRAGMA table_info(webhooks)")]
+        if 'batching' not in columns:
+            db.execute("ALTER TABLE webhooks ADD COLUMN batching TEXT")
+        
+        return db
+    
+    def _import_webhook_files(self):
+        """Move webhooks saved as JSON files by older versions into the database"""
+        for file in self.webhooks_dir.glob("*.json"):
+            try:
+                with open(file, 'r') as f:
+                    webhook = json.load(f)
+                
+                with self.db_lock:
+                    self._insert_webhook(webhook)
+                file.unlink()
+                logger.info(f"Imported webhook file {file}")
+            except Exception as e:
+                logger.error(f"Error importing webhook file {file}: {e}")
+    
+    def _insert_webhook(self, webhook):
+        """Insert a webhook dict into the database (caller holds self.db_lock)"""
+        stats = webhook.get('stats') or {}
+        events = webhook.get('events', [])
+        
+        self.db.execute("BEGIN")
+        try:
+            self.db.execute(
+                """INSERT OR REPLACE INTO webhooks (
+                       id, url, description, events, secret, format, headers,
+                       batching, created_at, updated_at, active,
+                       total_deliveries, successful_deliveries,
+                       failed_deliveries, last_delivery_at, last_delivery_status
+                   ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    webhook['id'],
+                    webhook['url'],
+                    webhook.get('description'),
+                    json.dumps(events),
+                    webhook.get('secret'),
+                    webhook.get('format', 'json'),
+                    json.dumps(webhook.get('headers') or {}),
+                    json.dumps(webhook.get('batching')),
+                    webhook.get('created_at'),
+                    webhook.get('updated_at'),
+                    int(bool(webhook.get('active', True))),
+                    stats.get('total_deliveries', 0),
+                    stats.get('successful_deliveries', 0),
+                    stats.get('failed_deliveries', 0),
+                    stats.get('last_delivery_at'),
+                    stats.get('last_delivery_status')
+                )
+            )
+            self._set_webhook_events(webhook['id'], events)
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+    
+    def _set_webhook_events(self, webhook_id, events):
+        """Replace a webhook's rows in webhook_events (caller holds self.db_lock)"""
+        self.db.execute("DELETE FROM webhook_events WHERE webhook_id = ?", (webhook_id,))
+        self.db.executemany(
+            "INSERT OR IGNORE INTO webhook_events (webhook_id, event) VALUES (?, ?)",
+            [(webhook_id, event) for event in events]
+        )
+    
+    def _load_webhook(self, webhook_id):
+        """Load a webhook from the database, secret included
+        
+        Args:
+            webhook_id (str): The ID of the webhook
+            
+        Returns:
+            dict: Webhook details or None if not found
+        """
+        with self.db_lock:
+            row = self.db.execute(
+                "SELECT * FROM webhooks WHERE id = ?", (webhook_id,)
+            ).fetchone()
+        
+        return self._row_to_webhook(row) if row else None
+    
+    def _get_webhook_cached(self, webhook_id):
+        """Get a webhook's delivery target, reusing the one built last time
+        
+        Args:
+            webhook_id (str): The ID of the webhook
+            
+        Returns:
+            DeliveryTarget: The webhook's delivery target or None if not found
+        """
+        with self.db_lock:
+            version = self.db.execute("PRAGMA data_version").fetchone()[0]
+            if version != self.db_version:
+                self.webhook_cache.clear()
+                self.db_version = version
+            
+            target = self.webhook_cache.get(webhook_id)
+            if target is None:
+                row = self.db.execute(
+                    "SELECT url, headers, secret FROM webhooks WHERE id = ?", (webhook_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                target = self.webhook_cache[webhook_id] = DeliveryTarget(
+                    row['url'],
+                    json.loads(row['headers']),
+                    self._hmac_template(row['secret']) if row['secret'] else None
+                )
+        
+        return target
+    
+    def _row_to_webhook(self, row):
+        """Convert a webhooks table row to the webhook dict returned by the API"""
+        return {
+            "id": row['id'],
+            "url": row['url'],
+            "description": row['description'],
+            "events": json.loads(row['events']),
+            "secret": row['secret'],
+            "format": row['format'],
+            "headers": json.loads(row['headers']),
+            "batching": json.loads(row['batching'] or 'null'),
+            "created_at": row['created_at'],
+            "updated_at": row['updated_at'],
+            "active": bool(row['active']),
+            "stats": {
+                "total_deliveries": row['total_deliveries'],
+                "successful_deliveries": row['successful_deliveries'],
+                "failed_deliveries": row['failed_deliveries'],
+                "last_delivery_at": row['last_delivery_at'],
+                "last_delivery_status": row['last_delivery_status']
+            }
+        }
+    
     def save_config(self):
         """Save configuration to config file"""
         config_file = self.data_dir / "webhook_config.json"
@@ -118,7 +531,8 @@ class WebhookManager:
         except Exception as e:
             logger.error(f"Error saving webhook config: {e}")
     
-    def register_webhook(self, url, description=None, events=None, secret=None, format="json", headers=None):
+    def register_webhook(self, url, description=None, events=None, secret=None, format="json", headers=None,
+                         batching=None):
         """Register a new webhook
         
         Args:
@@ -128,6 +542,10 @@ class WebhookManager:
             secret (str, optional): Secret for signing payloads
             format (str, optional): Payload format (json or xml)
             headers (dict, optional): Additional headers to send
+            batching (dict, optional): Send events together as one JSON array,
+                as {"enabled": True, "max_events": 100, "max_wait_ms": 1000};
+                a batch goes out when it's full or max_wait_ms after its
+                first event. JSON webhooks only
             
         Returns:
             str: Webhook ID if successful, None otherwise
@@ -148,6 +566,7 @@ class WebhookManager:
             "secret": secret or self._generate_secret(),
             "format": format.lower(),
             "headers": headers or {},
+            "batching": batching,
             "created_at": datetime.now().isoformat(),
             "updated_at": datetime.now().isoformat(),
             "active": True,
@@ -161,11 +580,9 @@ class WebhookManager:
         }
         
         # Save webhook configuration
-        webhook_file = self.webhooks_dir / f"{webhook_id}.json"
-        
         try:
-            with open(webhook_file, 'w') as f:
-                json.dump(webhook, f, indent=2)
+            with self.db_lock:
+                self._insert_webhook(webhook)
             logger.info(f"Webhook registered: {webhook_id} for {url}")
             return webhook_id
         except Exception as e:
@@ -182,28 +599,42 @@ class WebhookManager:
         Returns:
             bool: True if successful, False otherwise
         """
-        webhook_file = self.webhooks_dir / f"{webhook_id}.json"
-        
-        if not webhook_file.exists():
-            logger.error(f"Webhook not found: {webhook_id}")
+        url = kwargs.get('url', 'https://')
+        if not url or not str(url).startswith(('http://', 'https://')):
+            logger.error(f"Invalid webhook URL: {url}")
             return False
         
+        # Update fields
+        columns = []
+        values = []
+        for key, value in kwargs.items():
+            if key in UPDATABLE_FIELDS:
+                columns.append(f"{key} = ?")
+                values.append(UPDATABLE_FIELDS[key](value))
+        
+        # Update timestamp
+        columns.append("updated_at = ?")
+        values.append(datetime.now().isoformat())
+        
         try:
-            # Load existing webhook
-            with open(webhook_file, 'r') as f:
-                webhook = json.load(f)
-            
-            # Update fields
-            for key, value in kwargs.items():
-                if key in webhook and key not in ['id', 'created_at', 'stats']:
-                    webhook[key] = value
-            
-            # Update timestamp
-            webhook['updated_at'] = datetime.now().isoformat()
+            with self.db_lock:
+                self.db.execute("BEGIN")
+                try:
+                    cursor = self.db.execute(
+                        f"UPDATE webhooks SET {', '.join(columns)} WHERE id = ?",
+                        values + [webhook_id]
+                    )
+                    if cursor.rowcount and 'events' in kwargs:
+                        self._set_webhook_events(webhook_id, kwargs['events'] or [])
+                    self.db.execute("COMMIT")
+                except Exception:
+                    self.db.execute("ROLLBACK")
+                    raise
+                self.webhook_cache.pop(webhook_id, None)
             
-            # Save updated webhook
-            with open(webhook_file, 'w') as f:
-                json.dump(webhook, f, indent=2)
+            if not cursor.rowcount:
+                logger.error(f"Webhook not found: {webhook_id}")
+                return False
             
             logger.info(f"Webhook updated: {webhook_id}")
             return True
@@ -220,15 +651,34 @@ class WebhookManager:
         Returns:
             bool: True if successful, False otherwise
         """
-        webhook_file = self.webhooks_dir / f"{webhook_id}.json"
-        
-        if not webhook_file.exists():
-            logger.error(f"Webhook not found: {webhook_id}")
-            return False
-        
         try:
-            # Delete the webhook file
-            webhook_file.unlink()
+            with self.db_lock:
+                self.db.execute("BEGIN")
+                try:
+                    cursor = self.db.execute("DELETE FROM webhooks WHERE id = ?", (webhook_id,))
+                    self.db.execute("DELETE FROM webhook_events WHERE webhook_id = ?", (webhook_id,))
+                    self.db.execute("COMMIT")
+                except Exception:
+                    self.db.execute("ROLLBACK")
+                    raise
+                self.webhook_cache.pop(webhook_id, None)
+            
+            if not cursor.rowcount:
+                logger.error(f"Webhook not found: {webhook_id}")
+                return False
+            
+            # Drop its pending retries, batched events and delivery limits
+            with self.batch_lock:
+                self.batches.pop(webhook_id, None)
+            with self.limits_lock:
+                self.rate_limits.pop(webhook_id, None)
+                self.breakers.pop(webhook_id, None)
+            with self.retry_condition:
+                self.retry_heap[:] = [
+                    entry for entry in self.retry_heap if entry[2].webhook_id != webhook_id
+                ]
+                heapq.heapify(self.retry_heap)
+            
             logger.info(f"Webhook deleted: {webhook_id}")
             return True
         except Exception as e:
@@ -244,15 +694,12 @@ class WebhookManager:
         Returns:
             dict: Webhook details or None if not found
         """
-        webhook_file = self.webhooks_dir / f"{webhook_id}.json"
-        
-        if not webhook_file.exists():
-            logger.error(f"Webhook not found: {webhook_id}")
-            return None
-        
         try:
-            with open(webhook_file, 'r') as f:
-                webhook = json.load(f)
+            webhook = self._load_webhook(webhook_id)
+            
+            if webhook is None:
+                logger.error(f"Webhook not found: {webhook_id}")
+                return None
             
             # Remove secret from the returned data for security
             if 'secret' in webhook:
@@ -274,25 +721,23 @@ class WebhookManager:
         """
         webhooks = []
         
+        query = "SELECT * FROM webhooks"
+        if active_only:
+            # Filter by active status if requested
+            query += " WHERE active = 1"
+        query += " ORDER BY created_at"
+        
         try:
-            webhook_files = list(self.webhooks_dir.glob("*.json"))
+            with self.db_lock:
+                rows = self.db.execute(query).fetchall()
             
-            for file in webhook_files:
-                try:
-                    with open(file, 'r') as f:
-                        webhook = json.load(f)
-                    
-                    # Filter by active status if requested
-                    if active_only and not webhook.get('active', True):
-                        continue
-                    
-                    # Remove secret from the returned data for security
-                    if 'secret' in webhook:
-                        webhook['secret'] = '••••••••'
-                    
-                    webhooks.append(webhook)
-                except Exception as e:
-                    logger.error(f"Error loading webhook file {file}: {e}")
+            for row in rows:
+                webhook = self._row_to_webhook(row)
+                
+                # Remove secret from the returned data for security
+                webhook['secret'] = '••••••••'
+                
+                webhooks.append(webhook)
             
             return webhooks
         except Exception as e:
@@ -312,50 +757,50 @@ class WebhookManager:
         """
         count = 0
         
+        # Active webhooks subscribed to this event, optionally only those
+        # in the filter list
+        query = (
+            "SELECT w.id, w.format, w.batching FROM webhooks w"
+            " JOIN webhook_events e ON e.webhook_id = w.id"
+            " WHERE e.event = ? AND w.active = 1"
+        )
+        params = [event]
+        if filter_ids:
+            query += f" AND w.id IN ({', '.join('?' * len(filter_ids))})"
+            params.extend(filter_ids)
+        
+        # The payload formatted once for each format subscribers use
+        bodies = {}
+        
         try:
-            # Get all webhooks
-            webhook_files = list(self.webhooks_dir.glob("*.json"))
+            with self.db_lock:
+                webhooks = self.db.execute(query, params).fetchall()
             
-            for file in webhook_files:
+            for webhook_id, format_type, batching in webhooks:
                 try:
-                    with open(file, 'r') as f:
-                        webhook = json.load(f)
-                    
-                    # Skip if webhook is not active
-                    if not webhook.get('active', True):
+                    batching = json.loads(batching or 'null')
+                    if format_type == 'json' and batching and batching.get('enabled'):
+                        self._add_to_batch(webhook_id, batching, event, payload)
+                        count += 1
                         continue
                     
-                    # Skip if this webhook ID is not in the filter list
-                    if filter_ids and webhook['id'] not in filter_ids:
-                        continue
-                    
-                    # Skip if this webhook doesn't subscribe to this event
-                    if event not in webhook.get('events', []):
-                        continue
+                    body = bodies.get(format_type)
+                    if body is None:
+                        body = bodies[format_type] = self._format_payload(payload, format_type)
                     
                     # Queue the delivery
-                    delivery_id = str(uuid.uuid4())
-                    delivery = {
-                        'id': delivery_id,
-                        'webhook_id': webhook['id'],
-                        'event': event,
-                        'payload': payload,
-                        'created_at': datetime.now().isoformat(),
-                        'attempts': 0,
-                        'max_attempts': self.config['delivery']['max_retries']
-                    }
-                    
-                    # Save delivery record
-                    delivery_file = self.delivery_dir / f"{delivery_id}.json"
-                    with open(delivery_file, 'w') as f:
-                        json.dump(delivery, f, indent=2)
-                    
-                    # Queue for delivery
-                    self.delivery_queue.put((delivery_id, webhook['id']))
+                    delivery = Delivery(
+                        webhook_id,
+                        event,
+                        format_type,
+                        body,
+                        self.config['delivery']['max_retries']
+                    )
+                    self.delivery_queue.put(delivery)
                     count += 1
                     
                 except Exception as e:
-                    logger.error(f"Error processing webhook file {file}: {e}")
+                    logger.error(f"Error queuing delivery for webhook {webhook_id}: {e}")
             
             logger.info(f"Triggered {count} webhooks for event {event}")
             return count
@@ -363,147 +808,307 @@ class WebhookManager:
             logger.error(f"Error triggering webhooks: {e}")
             return 0
     
+    def _add_to_batch(self, webhook_id, batching, event, payload):
+        """Buffer an event for a batching webhook, queuing the batch once full
+        
+        Args:
+            webhook_id (str): The ID of the webhook
+            batching (dict): The webhook's batching settings
+            event (str): The event name
+            payload (dict): The payload to send
+        """
+        max_events = batching.get('max_events', DEFAULT_BATCH_MAX_EVENTS)
+        
+        with self.batch_lock:
+            batch = self.batches.get(webhook_id)
+            started = batch is None
+            if started:
+                batch = self.batches[webhook_id] = PendingBatch(webhook_id)
+            
+            batch.events.append({'event': event, 'payload': payload})
+            
+            full = len(batch.events) >= max_events
+            if full:
+                del self.batches[webhook_id]
+        
+        if full:
+            self._queue_batch(batch)
+        elif started:
+            # The scheduler sends whatever has arrived once max_wait_ms is up
+            max_wait = batching.get('max_wait_ms', DEFAULT_BATCH_MAX_WAIT_MS) / 1000
+            with self.retry_condition:
+                heapq.heappush(self.retry_heap, (time.monotonic() + max_wait, batch.id, batch))
+                self.retry_condition.notify()
+    
+    def _queue_batch(self, batch):
+        """Queue a batch of events as one delivery
+        
+        Args:
+            batch (PendingBatch): The batch to send
+        """
+        delivery = Delivery(
+            batch.webhook_id,
+            'batch',
+            'json',
+            json_bytes(batch.events),
+            self.config['delivery']['max_retries'],
+            batched=True
+        )
+        self.delivery_queue.put(delivery)
+    
     def _delivery_worker(self):
         """Worker thread for webhook delivery"""
         while True:
             try:
                 # Get a delivery from the queue
-                delivery_id, webhook_id = self.delivery_queue.get()
+                delivery = self.delivery_queue.get()
                 
                 # Process the delivery
-                self._process_delivery(delivery_id, webhook_id)
+                self._process_delivery(delivery)
                 
                 # Mark the task as done
                 self.delivery_queue.task_done()
             except Exception as e:
                 logger.error(f"Error in webhook delivery worker: {e}")
     
-    def _process_delivery(self, delivery_id, webhook_id):
+    def _schedule_retry(self, delivery, delay):
+        """Queue a delivery again once delay seconds have passed
+        
+        Args:
+            delivery (Delivery): The delivery to retry
+            delay (float): Seconds to wait before retrying
+        """
+        with self.retry_condition:
+            heapq.heappush(self.retry_heap, (time.monotonic() + delay, delivery.id, delivery))
+            self.retry_condition.notify()
+    
+    def _retry_scheduler(self):
+        """Scheduler thread that moves due retries and batches onto the delivery queue"""
+        while True:
+            with self.retry_condition:
+                # Sleep until the earliest retry is due (or a new one arrives)
+                while True:
+                    now = time.monotonic()
+                    if self.retry_heap and self.retry_heap[0][0] <= now:
+                        break
+                    timeout = self.retry_heap[0][0] - now if self.retry_heap else None
+                    self.retry_condition.wait(timeout)
+                
+                due = []
+                while self.retry_heap and self.retry_heap[0][0] <= now:
+                    due.append(heapq.heappop(self.retry_heap)[2])
+            
+            for item in due:
+                if isinstance(item, PendingBatch):
+                    # Unless it filled up and went out already
+                    with self.batch_lock:
+                        current = self.batches.get(item.webhook_id) is item
+                        if current:
+                            del self.batches[item.webhook_id]
+                    if current:
+                        self._queue_batch(item)
+                else:
+                    self.delivery_queue.put(item)
+    
+    def _process_delivery(self, delivery):
         """Process a webhook delivery
         
         Args:
-            delivery_id (str): The ID of the delivery
-            webhook_id (str): The ID of the webhook
+            delivery (Delivery): The delivery to attempt
         """
-        delivery_file = self.delivery_dir / f"{delivery_id}.json"
-        webhook_file = self.webhooks_dir / f"{webhook_id}.json"
+        delivery_id = delivery.id
+        webhook_id = delivery.webhook_id
+        target = self._get_webhook_cached(webhook_id)
         
-        if not delivery_file.exists() or not webhook_file.exists():
-            logger.error(f"Delivery {delivery_id} or webhook {webhook_id} not found")
+        if target is None:
+            logger.error(f"Webhook {webhook_id} for delivery {delivery_id} not found")
             return
         
         try:
-            # Load delivery and webhook
-            with open(delivery_file, 'r') as f:
-                delivery = json.load(f)
-            
-            with open(webhook_file, 'r') as f:
-                webhook = json.load(f)
-            
             # Check if we've exceeded max attempts
-            if delivery['attempts'] >= delivery['max_attempts']:
+            if delivery.attempts >= delivery.max_attempts:
                 logger.warning(f"Delivery {delivery_id} exceeded max attempts")
-                self._update_delivery_status(delivery_id, 'failed', "Exceeded max attempts")
+                self._update_delivery_status(delivery, 'failed', "Exceeded max attempts")
                 self._update_webhook_stats(webhook_id, False)
                 return
             
-            # Increment attempt counter
-            delivery['attempts'] += 1
-            
-            # Format the payload
-            formatted_payload = self._format_payload(delivery['payload'], webhook['format'])
-            
-            # Prepare headers
-            headers = {
-                'Content-Type': 'application/json' if webhook['format'] == 'json' else 'application/xml',
-                'User-Agent': 'USCodeBrowser-Webhook/1.0',
-                'X-USCode-Event': delivery['event'],
-                'X-USCode-Delivery': delivery_id
-            }
-            
-            # Add custom headers
-            if webhook.get('headers'):
-                headers.update(webhook['headers'])
-            
-            # Sign the payload if enabled
-            if self.config['security']['sign_payloads'] and webhook.get('secret'):
-                signature = self._sign_payload(formatted_payload, webhook['secret'])
-                headers[self.config['security']['signature_header']] = signature
-            
-            # Send the webhook
-            response = requests.post(
-                webhook['url'],
-                data=formatted_payload,
-                headers=headers,
-                timeout=self.config['delivery']['timeout_seconds']
-            )
-            
-            # Check response
-            success = 200 <= response.status_code < 300
+            if self._circuit_open(webhook_id):
+                # The endpoint keeps failing; count the attempt as failed
+                # without tying up a worker until it times out
+                delivery.attempts += 1
+                success = False
+                status_message = "Not sent: circuit open after repeated failures"
+            else:
+                # Hold deliveries to a webhook that's over its rate limit,
+                # without using up an attempt
+                wait = self._rate_limit_wait(webhook_id)
+                if wait:
+                    self._schedule_retry(delivery, wait)
+                    return
+                
+                # Increment attempt counter
+                delivery.attempts += 1
+                
+                success, status_message = self._send(delivery, target)
+                self._record_result(webhook_id, success)
             
             # Update delivery status
-            status_message = f"HTTP {response.status_code}" if success else f"HTTP {response.status_code}: {response.text[:100]}"
-            self._update_delivery_status(delivery_id, 'delivered' if success else 'failed', status_message)
+            self._update_delivery_status(delivery, 'delivered' if success else 'failed', status_message)
             
             # Update webhook stats
             self._update_webhook_stats(webhook_id, success)
             
             # Log the result
             if success:
-                logger.info(f"Webhook {webhook_id} delivered successfully: {delivery_id}")
+                # Debug level, with lazy arguments: one line per delivery
+                # isn't worth formatting unless someone asked for it
+                logger.debug("Webhook %s delivered successfully: %s", webhook_id, delivery_id)
             else:
                 logger.warning(f"Webhook {webhook_id} delivery failed: {delivery_id} - {status_message}")
                 
                 # Retry if needed
-                if delivery['attempts'] < delivery['max_attempts']:
-                    # Save updated delivery
-                    with open(delivery_file, 'w') as f:
-                        json.dump(delivery, f, indent=2)
-                    
+                if delivery.attempts < delivery.max_attempts:
                     # Re-queue after delay
                     retry_delay = self.config['delivery']['retry_delay_seconds']
-                    logger.info(f"Requeuing delivery {delivery_id} in {retry_delay} seconds")
-                    
-                    def requeue():
-                        time.sleep(retry_delay)
-                        self.delivery_queue.put((delivery_id, webhook_id))
-                    
-                    Thread(target=requeue).start()
+                    logger.debug("Requeuing delivery %s in %s seconds", delivery_id, retry_delay)
+                    self._schedule_retry(delivery, retry_delay)
             
         except Exception as e:
             logger.error(f"Error processing delivery {delivery_id}: {e}")
-            self._update_delivery_status(delivery_id, 'failed', str(e))
+            self._update_delivery_status(delivery, 'failed', str(e))
             self._update_webhook_stats(webhook_id, False)
+            self._record_result(webhook_id, False)
+    
+    def _send(self, delivery, target):
+        """POST a delivery to its webhook
+        
+        Args:
+            delivery (Delivery): The delivery to send
+            target (DeliveryTarget): The webhook's delivery target
+            
+        Returns:
+            tuple: (success, status message)
+        """
+        delivery_id = delivery.id
+        
+        # Prepare headers, custom headers last so they can override ours
+        headers = {
+            'Content-Type': 'application/json' if delivery.format == 'json' else 'application/xml',
+            'User-Agent': 'USCodeBrowser-Webhook/1.0',
+            'X-USCode-Event': delivery.event,
+            'X-USCode-Delivery': delivery_id,
+            **target.headers
+        }
+        if delivery.batched:
+            headers['X-USCode-Batch'] = '1'
+        
+        # Sign the payload if enabled
+        if self.config['security']['sign_payloads'] and target.signer is not None:
+            signature = self._sign_payload(delivery.body, target.signer)
+            headers[self.config['security']['signature_header']] = signature
+        
+        # Send the webhook, streaming so the body is only read as needed
+        response = self.session.post(
+            target.url,
+            data=delivery.body,
+            headers=headers,
+            timeout=self.config['delivery']['timeout_seconds'],
+            stream=True
+        )
+        
+        try:
+            # Check response
+            success = 200 <= response.status_code < 300
+            
+            if success:
+                # Reading the (usually empty) body lets the connection go
+                # back to the pool
+                response.content
+                status_message = f"HTTP {response.status_code}"
+            else:
+                # Only the start of an error page goes in the status
+                # message; the connection is dropped rather than
+                # downloading the rest
+                snippet = response.raw.read(400, decode_content=True)
+                status_message = f"HTTP {response.status_code}: {snippet.decode('utf-8', 'replace')[:100]}"
+        finally:
+            response.close()
+        
+        return success, status_message
+    
+    def _circuit_open(self, webhook_id):
+        """Check whether deliveries to a webhook are paused after repeated failures"""
+        with self.limits_lock:
+            breaker = self.breakers.get(webhook_id)
+            return breaker is not None and breaker.is_open()
+    
+    def _record_result(self, webhook_id, success):
+        """Record a delivery attempt's outcome in the webhook's circuit breaker"""
+        settings = self.config.get('circuit_breaker', {})
+        
+        with self.limits_lock:
+            breaker = self.breakers.get(webhook_id)
+            if breaker is None:
+                breaker = self.breakers[webhook_id] = CircuitBreaker()
+            breaker.record(
+                success,
+                settings.get('failure_threshold', 5),
+                settings.get('open_seconds', 60)
+            )
+    
+    def _rate_limit_wait(self, webhook_id):
+        """Take a request from a webhook's rate limits if both allow one
+        
+        Args:
+            webhook_id (str): The ID of the webhook
+            
+        Returns:
+            float: 0 if the delivery may be sent now, else seconds to wait
+        """
+        limits = self.config['rate_limiting']
+        if not limits.get('enabled'):
+            return 0
+        
+        with self.limits_lock:
+            buckets = self.rate_limits.get(webhook_id)
+            if buckets is None:
+                buckets = self.rate_limits[webhook_id] = (
+                    TokenBucket(limits['max_per_minute'], 60),
+                    TokenBucket(limits['max_per_hour'], 3600)
+                )
+            
+            wait = max(bucket.wait_time() for bucket in buckets)
+            if not wait:
+                for bucket in buckets:
+                    bucket.take()
+            return wait
     
-    def _update_delivery_status(self, delivery_id, status, message=None):
-        """Update the status of a delivery
+    def _update_delivery_status(self, delivery, status, message=None):
+        """Record the status of a delivery in the delivery log
         
         Args:
-            delivery_id (str): The ID of the delivery
+            delivery (Delivery): The delivery
             status (str): The new status
             message (str, optional): Status message
         """
-        delivery_file = self.delivery_dir / f"{delivery_id}.json"
-        
-        if not delivery_file.exists():
-            logger.error(f"Delivery {delivery_id} not found")
-            return
+        record = {
+            'id': delivery.id,
+            'webhook_id': delivery.webhook_id,
+            'event': delivery.event,
+            'created_at': delivery.created_at,
+            'attempts': delivery.attempts,
+            'max_attempts': delivery.max_attempts,
+            'status': status,
+            'status_message': message,
+            'updated_at': datetime.now().isoformat()
+        }
         
         try:
-            # Load delivery
-            with open(delivery_file, 'r') as f:
-                delivery = json.load(f)
-            
-            # Update status
-            delivery['status'] = status
-            delivery['status_message'] = message
-            delivery['updated_at'] = datetime.now().isoformat()
-            
-            # Save updated delivery
-            with open(delivery_file, 'w') as f:
-                json.dump(delivery, f, indent=2)
+            line = json_bytes(record) + b"\n"
+            with self.delivery_log_lock:
+                self.delivery_log.write(line)
         except Exception as e:
-            logger.error(f"Error updating delivery status for {delivery_id}: {e}")
+            logger.error(f"Error updating delivery status for {delivery.id}: {e}")
     
     def _update_webhook_stats(self, webhook_id, success):
         """Update the stats for a webhook
@@ -512,40 +1117,28 @@ class WebhookManager:
             webhook_id (str): The ID of the webhook
             success (bool): Whether the delivery was successful
         """
-        webhook_file = self.webhooks_dir / f"{webhook_id}.json"
-        
-        if not webhook_file.exists():
-            logger.error(f"Webhook {webhook_id} not found")
-            return
-        
         try:
-            # Load webhook
-            with open(webhook_file, 'r') as f:
-                webhook = json.load(f)
-            
-            # Initialize stats if needed
-            if 'stats' not in webhook:
-                webhook['stats'] = {
-                    'total_deliveries': 0,
-                    'successful_deliveries': 0,
-                    'failed_deliveries': 0,
-                    'last_delivery_at': None,
-                    'last_delivery_status': None
-                }
-            
-            # Update stats
-            webhook['stats']['total_deliveries'] += 1
-            if success:
-                webhook['stats']['successful_deliveries'] += 1
-            else:
-                webhook['stats']['failed_deliveries'] += 1
+            # One statement, so concurrent deliveries can't lose updates
+            with self.db_lock:
+                cursor = self.db.execute(
+                    """UPDATE webhooks SET
+                           total_deliveries = total_deliveries + 1,
+                           successful_deliveries = successful_deliveries + ?,
+                           failed_deliveries = failed_deliveries + ?,
+                           last_delivery_at = ?,
+                           last_delivery_status = ?
+                       WHERE id = ?""",
+                    (
+                        int(success),
+                        int(not success),
+                        datetime.now().isoformat(),
+                        'success' if success else 'failed',
+                        webhook_id
+                    )
+                )
             
-            webhook['stats']['last_delivery_at'] = datetime.now().isoformat()
-            webhook['stats']['last_delivery_status'] = 'success' if success else 'failed'
-            
-            # Save updated webhook
-            with open(webhook_file, 'w') as f:
-                json.dump(webhook, f, indent=2)
+            if not cursor.rowcount:
+                logger.error(f"Webhook {webhook_id} not found")
         except Exception as e:
             logger.error(f"Error updating webhook stats for {webhook_id}: {e}")
     
@@ -557,74 +1150,68 @@ class WebhookManager:
             format_type (str): The format type (json or xml)
             
         Returns:
-            str: Formatted payload
+            bytes: Formatted payload, UTF-8 encoded
         """
         if format_type == 'json':
-            return json.dumps(payload)
+            return json_bytes(payload)
         elif format_type == 'xml':
-            # Simple XML conversion (for more complex needs, use a proper XML library)
-            xml = ['<?xml version="1.0" encoding="UTF-8"?>']
-            xml.append('<webhook-payload>')
+            # The tree escapes text, which the string-built version didn't
+            root = ET.Element('webhook-payload')
             
-            def dict_to_xml(d, parent_tag=None):
-                result = []
+            def dict_to_xml(parent, d):
                 for key, value in d.items():
                     if isinstance(value, dict):
-                        result.append(f'<{key}>')
-                        result.append(dict_to_xml(value, key))
-                        result.append(f'</{key}>')
+                        dict_to_xml(ET.SubElement(parent, key), value)
                     elif isinstance(value, list):
                         for item in value:
                             if isinstance(item, dict):
-                                result.append(f'<{key}>')
-                                result.append(dict_to_xml(item, key))
-                                result.append(f'</{key}>')
+                                dict_to_xml(ET.SubElement(parent, key), item)
                             else:
-                                result.append(f'<{key}>{item}</{key}>')
+                                ET.SubElement(parent, key).text = str(item)
                     else:
-                        result.append(f'<{key}>{value}</{key}>')
-                return '\n'.join(result)
+                        ET.SubElement(parent, key).text = str(value)
             
-            xml.append(dict_to_xml(payload))
-            xml.append('</webhook-payload>')
-            return '\n'.join(xml)
+            dict_to_xml(root, payload)
+            return ET.tostring(root, encoding='UTF-8', xml_declaration=True)
         else:
             logger.warning(f"Unsupported format: {format_type}, defaulting to JSON")
-            return json.dumps(payload)
+            return json_bytes(payload)
     
-    def _sign_payload(self, payload, secret):
-        """Sign the payload using the webhook secret
+    def _hmac_template(self, secret):
+        """Build the HMAC for a webhook secret, to be copied for each payload
+        
+        Copying a keyed HMAC skips deriving the padded keys from the secret
+        again for every delivery.
         
         Args:
-            payload (str): The payload to sign
-            secret (str): The secret to use for signing
+            secret (str): The webhook secret
             
         Returns:
-            str: Signature
+            hmac.HMAC: HMAC keyed with the secret, with no data yet
         """
         algorithm = self.config['security']['signature_algorithm']
+        digestmod = SIGNATURE_DIGESTS.get(algorithm)
         
-        if algorithm == 'sha256':
-            signature = hmac.new(
-                secret.encode('utf-8'),
-                payload.encode('utf-8'),
-                hashlib.sha256
-            ).hexdigest()
-        elif algorithm == 'sha1':
-            signature = hmac.new(
-                secret.encode('utf-8'),
-                payload.encode('utf-8'),
-                hashlib.sha1
-            ).hexdigest()
-        else:
+        if digestmod is None:
             logger.warning(f"Unsupported signature algorithm: {algorithm}, defaulting to sha256")
-            signature = hmac.new(
-                secret.encode('utf-8'),
-                payload.encode('utf-8'),
-                hashlib.sha256
-            ).hexdigest()
+            digestmod = hashlib.sha256
+        
+        return hmac.new(secret.encode('utf-8'), digestmod=digestmod)
+    
+    def _sign_payload(self, payload, signer):
+        """Sign the payload using the webhook's keyed HMAC
+        
+        Args:
+            payload (bytes): The payload to sign
+            signer (hmac.HMAC): HMAC from _hmac_template for the webhook secret
+            
+        Returns:
+            str: Signature
+        """
+        mac = signer.copy()
+        mac.update(payload)
         
-        return f"{algorithm}={signature}"
+        return f"{self.config['security']['signature_algorithm']}={mac.hexdigest()}"
     
     def _generate_secret(self):
         """Generate a random secret for webhook signing
@@ -632,11 +1219,25 @@ class WebhookManager:
         Returns:
             str: Random secret
         """
-        return uuid.uuid4().hex + uuid.uuid4().hex
+        return secrets.token_hex(32)
 
 # Command-line interface
 if __name__ == "__main__":
     import argparse
+    from logging.handlers import RotatingFileHandler
+    
+    # Configure logging
+    log_dir = Path("logs")
+    log_dir.mkdir(exist_ok=True)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(),
+            RotatingFileHandler(log_dir / 'webhook_manager.log', maxBytes=50_000_000, backupCount=5)
+        ]
+    )
     
     parser = argparse.ArgumentParser(description='US Code Webhook Manager')
     parser.add_argument('--register', action='store_true', help='Register a new webhook')